@@ -112,6 +112,7 @@ class DeploymentManager:
         """Despliega configuraciones de Nagios vía NagiosQL"""
         self.logger.info("Desplegando Nagios vía NagiosQL...")
 
+        adapter = None
         try:
             # Crear adaptador NagiosQL
             nagiosql_config = self.config['nagiosql']
@@ -159,6 +160,10 @@ class DeploymentManager:
         except Exception as e:
             self.logger.error(f"Error en despliegue vía NagiosQL: {e}")
             return False
+        finally:
+            # Cerrar la conexión SSH persistente del adaptador
+            if adapter is not None:
+                adapter.close()
 
     def _deploy_nagios_direct(self, config_dir: Path, environment: str = "production") -> bool:
         """Despliega configuraciones de Nagios directamente (método original)"""
@@ -9,7 +9,12 @@ import json
 import os
 import yaml
 from datetime import datetime
-from jinja2 import Template
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class ElasticConfigGenerator:
@@ -17,6 +22,7 @@ class ElasticConfigGenerator:
 
     def __init__(self, json_data, output_dir="output/elastic"):
         self.data = json_data
+        self.service_name = json_data.get("identification", {}).get("service_name", "unknown")
         self.output_dir = output_dir
         self.templates_dir = "templates/elastic"
 
@@ -44,6 +50,11 @@ class ElasticConfigGenerator:
             "db_time": "%{NUMBER:db_time}ms"
         }
 
+    @staticmethod
+    def _slug(name):
+        """Normaliza un nombre para campos e identificadores (minúsculas, espacios a '_')"""
+        return name.lower().replace(" ", "_")
+
     def _generate_index_name(self, service_name, log_name):
         """Genera nombre de índice único"""
         service_clean = service_name.lower().replace(" ", "-").replace("_", "-")
@@ -104,38 +115,43 @@ class ElasticConfigGenerator:
             ]
         }
 
+        service_name = self.service_name
+        service_slug = self._slug(service_name)
+
+        # Extraer una sola vez (tipo, identificador, dirección) de todos los hosts
+        host_rows = []
+        for env in self.data.get("envs", []):
+            for host in env.get("hosts", []):
+                identifier = host.get("identifier", "")
+                host_rows.append((host.get("type", "host"), identifier, host.get("address", identifier)))
+
         # Crear inputs para cada log
         for log in self.data.get("logs", []):
             log_name = log.get("name", "")
             log_path = log.get("path", "")
             log_format = log.get("format", "Texto plano simple")
+            log_type = log_name.replace(".", "_")
 
             # Crear campos personalizados para el servicio
-            service_name = self.data.get("identification", {}).get("service_name", "unknown")
             fields = {
-                "service_name": service_name.lower().replace(" ", "_"),
-                "log_type": log_name.replace(".", "_"),
+                "service_name": service_slug,
+                "log_type": log_type,
                 "environment": "default"
             }
 
-            # Agregar información de hosts si está disponible
-            hosts_info = []
-            for env in self.data.get("envs", []):
-                for host in env.get("hosts", []):
-                    host_info = {
-                        "type": host.get("type", "host"),
-                        "identifier": host.get("identifier", ""),
-                        "address": host.get("address", host.get("identifier", ""))
-                    }
-                    hosts_info.append(host_info)
-            if hosts_info:
-                fields["hosts"] = hosts_info
+            # Agregar información de hosts si está disponible (listas propias por input
+            # para que YAML no genere anclas/alias entre inputs)
+            if host_rows:
+                fields["hosts"] = [
+                    {"type": host_type, "identifier": identifier, "address": address}
+                    for host_type, identifier, address in host_rows
+                ]
 
             input_config = {
                 "type": "log",
                 "paths": [log_path],
                 "fields": fields,
-                "tags": [service_name.lower(), log_name.replace(".", "_")],
+                "tags": [service_name.lower(), log_type],
                 "encoding": "utf-8"
             }
 
@@ -169,18 +185,20 @@ class ElasticConfigGenerator:
             }
         }
 
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
+        service_name = self.service_name
+        service_filter = f"[fields][service_name] == \"{self._slug(service_name)}\""
 
         # Crear filtros para cada tipo de log
         for log in self.data.get("logs", []):
             log_name = log.get("name", "")
             log_format = log.get("format", "Texto plano simple")
             patterns = log.get("patterns", [])
+            log_type_filter = f"[fields][log_type] == \"{log_name.replace('.', '_')}\""
 
             if log_format == "JSON estructurado":
                 # Procesamiento JSON
                 json_filter = {
-                    "if": f"[fields][log_type] == \"{log_name.replace('.', '_')}\"",
+                    "if": log_type_filter,
                     "json": {
                         "source": "message",
                         "target": "json_data"
@@ -193,7 +211,7 @@ class ElasticConfigGenerator:
                 grok_pattern = self._create_grok_pattern(patterns)
 
                 grok_filter = {
-                    "if": f"[fields][log_type] == \"{log_name.replace('.', '_')}\"",
+                    "if": log_type_filter,
                     "grok": {
                         "match": {"message": grok_pattern},
                         "patterns_dir": ["/usr/share/logstash/patterns"]
@@ -203,7 +221,7 @@ class ElasticConfigGenerator:
 
             # Agregar campos comunes a todos los logs
             mutate_filter = {
-                "if": f"[fields][service_name] == \"{service_name.lower().replace(' ', '_')}\"",
+                "if": service_filter,
                 "mutate": {
                     "add_field": {
                         "service": service_name,
@@ -218,7 +236,7 @@ class ElasticConfigGenerator:
 
     def generate_ingest_pipeline(self):
         """Genera pipeline de ingest para Elasticsearch"""
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
+        service_name = self.service_name
 
         pipeline = {
             "description": f"Pipeline de procesamiento para {service_name}",
@@ -268,7 +286,7 @@ class ElasticConfigGenerator:
 
     def generate_index_template(self):
         """Genera template de índice para Elasticsearch"""
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
+        service_name = self.service_name
 
         template = {
             "index_patterns": [f"{service_name.lower().replace(' ', '-')}*-*"],
@@ -328,10 +346,11 @@ class ElasticConfigGenerator:
 
     def generate_kibana_dashboards(self):
         """Genera configuración básica de dashboards para Kibana"""
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
+        service_name = self.service_name
+        service_slug = self._slug(service_name)
 
         dashboard = {
-            "id": f"{service_name.lower().replace(' ', '_')}_overview",
+            "id": f"{service_slug}_overview",
             "title": f"{service_name} - Overview",
             "description": f"Dashboard general para el servicio {service_name}",
             "panels": []
@@ -343,7 +362,7 @@ class ElasticConfigGenerator:
             "type": "search",
             "title": "Logs Recientes",
             "query": {
-                "query": f"fields.service_name: {service_name.lower().replace(' ', '_')}",
+                "query": f"fields.service_name: {service_slug}",
                 "language": "kuery"
             }
         }
@@ -376,19 +395,20 @@ class ElasticConfigGenerator:
 
     def generate_alerts_config(self):
         """Genera configuración de alertas basada en patrones críticos"""
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
+        service_name = self.service_name
+        service_slug = self._slug(service_name)
 
         alerts = []
 
         # Crear alerta para errores críticos
         critical_alert = {
-            "id": f"{service_name.lower().replace(' ', '_')}_critical_errors",
+            "id": f"{service_slug}_critical_errors",
             "name": f"Errores Críticos - {service_name}",
             "description": f"Alerta cuando se detectan errores críticos en {service_name}",
             "condition": {
                 "query": {
                     "match": {
-                        "fields.service_name": service_name.lower().replace(" ", "_")
+                        "fields.service_name": service_slug
                     }
                 },
                 "filter": [
@@ -409,19 +429,20 @@ class ElasticConfigGenerator:
         # Crear alertas específicas basadas en patrones de logs
         for log in self.data.get("logs", []):
             log_name = log.get("name", "")
+            log_type = log_name.replace(".", "_")
             patterns = log.get("patterns", [])
 
             # Buscar patrones que indiquen problemas
             for pattern in patterns:
                 if any(keyword in pattern.upper() for keyword in ["ERROR", "FAILED", "EXCEPTION", "CRITICAL"]):
                     pattern_alert = {
-                        "id": f"{service_name.lower().replace(' ', '_')}_{log_name.replace('.', '_')}_issues",
+                        "id": f"{service_slug}_{log_type}_issues",
                         "name": f"Problemas en {log_name} - {service_name}",
                         "description": f"Alerta para patrones problemáticos en {log_name}",
                         "condition": {
                             "query": {
                                 "match": {
-                                    "fields.log_type": log_name.replace(".", "_")
+                                    "fields.log_type": log_type
                                 }
                             }
                         }
@@ -473,8 +494,10 @@ class ElasticConfigGenerator:
 def generate_elastic_from_json(json_file, output_dir="output/elastic"):
     """Función principal para generar configuración de Elastic desde JSON"""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        # orjson.JSONDecodeError hereda de json.JSONDecodeError
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
         generator = ElasticConfigGenerator(data, output_dir)
         files, metadata = generator.generate_all_configs()
@@ -7,12 +7,20 @@ basado en formularios JSON para Nagios y Elastic Stack
 
 import json
 import os
+import hashlib
 import sys
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configurar logging global
 logging.basicConfig(
     level=logging.DEBUG,
@@ -29,11 +37,97 @@ from elastic_generator import generate_elastic_from_json
 from plugins.service_discovery import discover_services
 
 
+# Plantillas del reporte de resumen (se construyen una sola vez al importar el módulo)
+_REPORT_HEADER = """# Configuración de Monitorización - {service_name}
+
+**Fecha de generación:** {generated_at}
+**Servicio:** {service_name}
+**Prioridad:** {priority}
+
+## Resumen de Configuración
+
+### Información del Servicio
+- **Descripción:** {service_desc}
+- **Tecnologías:** {technologies}
+- **Responsables:** {owners}
+
+### Configuración de Nagios
+- **Hosts configurados:** {nagios_hosts}
+- **Servicios configurados:** {nagios_services}
+- **Contactos configurados:** {nagios_contacts}
+
+### Configuración de Elastic Stack
+- **Logs configurados:** {logs_count}
+- **Alertas configuradas:** {elastic_alerts}
+- **Centralized logs:** {centralized_logs}
+
+## Archivos Generados
+
+### Nagios
+"""
+
+_REPORT_NAGIOS_FILES = """
+- `hosts.cfg` - Definición de hosts ({hosts} hosts)
+- `services.cfg` - Definición de servicios ({services} servicios)
+- `contacts.cfg` - Grupos de contactos ({contacts} contactos)
+- `commands.cfg` - Comandos de chequeo
+- `nagios.cfg` - Configuración principal
+"""
+
+_REPORT_ELASTIC_FILES = """
+- `filebeat.yml` - Configuración de Filebeat
+- `logstash.conf` - Configuración de Logstash
+- `ingest_pipeline.json` - Pipeline de procesamiento
+- `index_template.json` - Template de índices
+- `kibana_dashboard.json` - Dashboard básico
+- `alerts.json` - Configuración de alertas
+"""
+
+_REPORT_DEPENDENCY = """- **{name}**
+  - Tipo: {type}
+  - Impacto: {impact}
+  - Puerto: {port}
+  - Protocolo: {protocol}
+  - Efecto: {effect}
+
+"""
+
+_REPORT_LOG = """- **{name}**
+  - Ruta: {path}
+  - Formato: {format}
+  - Retención: {retention}
+  - Patrones: {patterns}
+
+"""
+
+_REPORT_FOOTER = """
+## Instrucciones de Despliegue
+
+### Nagios
+1. Copiar los archivos `.cfg` a `/etc/nagios/objects/`
+2. Reiniciar servicio Nagios: `systemctl restart nagios`
+3. Verificar configuración: `nagios -v /etc/nagios/nagios.cfg`
+
+### Elastic Stack
+1. **Filebeat:** Copiar `filebeat.yml` a `/etc/filebeat/`
+2. **Logstash:** Copiar `logstash.conf` a `/etc/logstash/conf.d/`
+3. **Elasticsearch:** Crear el pipeline y template usando las APIs
+4. **Kibana:** Importar el dashboard y configurar las alertas
+
+## Notas Adicionales
+- Verificar que todas las rutas de logs sean accesibles
+- Ajustar permisos de archivos según sea necesario
+- Probar la configuración en ambiente de desarrollo primero
+"""
+
+
 class MonitoringAutomator:
     """Sistema principal de automatización de monitorización"""
 
-    def __init__(self, output_base_dir="output"):
+    def __init__(self, output_base_dir="output", skip_discovery_if_unchanged=False):
         self.output_base_dir = Path(output_base_dir)
+        self.skip_discovery_if_unchanged = skip_discovery_if_unchanged
+        self.discovery_cache_file = self.output_base_dir / ".discovery_cache.json"
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.logger = logging.getLogger('MonitoringAutomator')
 
@@ -45,8 +139,10 @@ class MonitoringAutomator:
         """Valida que el archivo JSON tenga la estructura correcta"""
         self.logger.info(f"Iniciando validación del archivo JSON: {json_file}")
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_file, 'rb') as f:
+                raw = f.read()
+            # orjson.JSONDecodeError hereda de json.JSONDecodeError
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
             self.logger.debug(f"Archivo JSON cargado exitosamente: {len(data)} secciones principales")
 
             # Validaciones básicas
@@ -131,6 +227,40 @@ class MonitoringAutomator:
             self.logger.error(f"Error inesperado durante validación: {e}")
             return False, None
 
+    def _discovery_fingerprint(self, data):
+        """
+        Calcula la huella del JSON de entrada completo: cualquier cambio (dependencias,
+        entornos, identificación, responsables, logs...) invalida la caché
+        """
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def run_service_discovery(self, data):
+        """Ejecuta la auto-detección, reutilizando el resultado anterior si el JSON de entrada no cambió"""
+        if not self.skip_discovery_if_unchanged:
+            return discover_services(data)
+
+        fingerprint = self._discovery_fingerprint(data)
+        try:
+            with open(self.discovery_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('fingerprint') == fingerprint:
+                self.logger.info("JSON de entrada sin cambios desde la última ejecución, omitiendo auto-detección")
+                return cache['data']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            self.logger.debug(f"Caché de auto-detección no utilizable: {e}")
+
+        data = discover_services(data)
+
+        try:
+            with open(self.discovery_cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': fingerprint, 'data': data}, f, ensure_ascii=False)
+            self.logger.debug(f"Huella de auto-detección guardada: {fingerprint}")
+        except (OSError, TypeError) as e:
+            self.logger.warning(f"No se pudo guardar la caché de auto-detección: {e}")
+
+        return data
+
     def generate_monitoring_configs(self, json_file, nagios_only=False, elastic_only=False):
         """Genera todas las configuraciones de monitorización"""
         self.logger.info("=" * 60)
@@ -149,7 +279,7 @@ class MonitoringAutomator:
         self.logger.info("Ejecutando auto-detección de servicios...")
         try:
             original_deps_count = len(data.get('dependencies', []))
-            data = discover_services(data)
+            data = self.run_service_discovery(data)
             new_deps_count = len(data.get('dependencies', []))
             self.logger.info(f"Auto-detección completada. Dependencias: {original_deps_count} -> {new_deps_count}")
         except Exception as e:
@@ -165,29 +295,28 @@ class MonitoringAutomator:
         all_files = []
         metadata = {}
 
+        # Nagios y Elastic se generan desde el mismo JSON de forma independiente: ejecutarlos en paralelo
+        generators = []
         if not elastic_only:
-            self.logger.info("Generando configuración de Nagios...")
-            try:
-                nagios_dir = execution_dir / "nagios"
-                nagios_files, nagios_meta = generate_nagios_from_json(json_file, str(nagios_dir))
-                all_files.extend(nagios_files)
-                metadata['nagios'] = nagios_meta
-                self.logger.info(f"Configuración de Nagios generada: {len(nagios_files)} archivos")
-            except Exception as e:
-                self.logger.error(f"Error generando configuración de Nagios: {e}")
-                return False
-
+            generators.append(('nagios', "Nagios", generate_nagios_from_json))
         if not nagios_only:
-            self.logger.info("Generando configuración de Elastic Stack...")
-            try:
-                elastic_dir = execution_dir / "elastic"
-                elastic_files, elastic_meta = generate_elastic_from_json(json_file, str(elastic_dir))
-                all_files.extend(elastic_files)
-                metadata['elastic'] = elastic_meta
-                self.logger.info(f"Configuración de Elastic Stack generada: {len(elastic_files)} archivos")
-            except Exception as e:
-                self.logger.error(f"Error generando configuración de Elastic Stack: {e}")
-                return False
+            generators.append(('elastic', "Elastic Stack", generate_elastic_from_json))
+
+        with ThreadPoolExecutor(max_workers=max(len(generators), 1)) as executor:
+            futures = []
+            for key, label, generate in generators:
+                self.logger.info(f"Generando configuración de {label}...")
+                futures.append((key, label, executor.submit(generate, json_file, str(execution_dir / key))))
+
+            for key, label, future in futures:
+                try:
+                    generated_files, generated_meta = future.result()
+                    all_files.extend(generated_files)
+                    metadata[key] = generated_meta
+                    self.logger.info(f"Configuración de {label} generada: {len(generated_files)} archivos")
+                except Exception as e:
+                    self.logger.error(f"Error generando configuración de {label}: {e}")
+                    return False
 
         # Generar reporte de resumen
         try:
@@ -207,116 +336,64 @@ class MonitoringAutomator:
         self.logger.debug("Generando reporte de resumen...")
         report_file = output_dir / "README.md"
 
-        service_name = json_data.get('identification', {}).get('service_name', 'Servicio desconocido')
-        priority = json_data.get('identification', {}).get('priority', 'No especificada')
-
-        report_content = f"""# Configuración de Monitorización - {service_name}
-
-**Fecha de generación:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Servicio:** {service_name}
-**Prioridad:** {priority}
-
-## Resumen de Configuración
-
-### Información del Servicio
-- **Descripción:** {json_data.get('identification', {}).get('service_desc', 'No especificada')}
-- **Tecnologías:** {', '.join([f"{tech.get('technology', '')} {tech.get('version', '')}" for tech in json_data.get('tech_stack', [])])}
-- **Responsables:** {', '.join([resp.get('nombre', '') for resp in json_data.get('responsables', [])])}
-
-### Configuración de Nagios
-- **Hosts configurados:** {len(metadata.get('nagios', {}).get('hosts', []))}
-- **Servicios configurados:** {len(metadata.get('nagios', {}).get('services', []))}
-- **Contactos configurados:** {len(metadata.get('nagios', {}).get('contacts', []))}
-
-### Configuración de Elastic Stack
-- **Logs configurados:** {len(json_data.get('logs', []))}
-- **Alertas configuradas:** {len(metadata.get('elastic', {}).get('alerts', []))}
-- **Centralized logs:** {json_data.get('centralized_logs', 'No especificado')}
-
-## Archivos Generados
-
-### Nagios
-"""
-
-        if 'nagios' in metadata:
-            nagios_dir = output_dir / "nagios"
-            if nagios_dir.exists():
-                report_content += f"""
-- `hosts.cfg` - Definición de hosts ({len(metadata['nagios']['hosts'])} hosts)
-- `services.cfg` - Definición de servicios ({len(metadata['nagios']['services'])} servicios)
-- `contacts.cfg` - Grupos de contactos ({len(metadata['nagios']['contacts'])} contactos)
-- `commands.cfg` - Comandos de chequeo
-- `nagios.cfg` - Configuración principal
-"""
-
-        report_content += "\n### Elastic Stack\n" if 'elastic' in metadata else "\n### Elastic Stack (No generado)\n"
+        identification = json_data.get('identification', {})
+        nagios_meta = metadata.get('nagios', {})
+        elastic_meta = metadata.get('elastic', {})
+
+        parts = [_REPORT_HEADER.format(
+            service_name=identification.get('service_name', 'Servicio desconocido'),
+            generated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            priority=identification.get('priority', 'No especificada'),
+            service_desc=identification.get('service_desc', 'No especificada'),
+            technologies=', '.join([f"{tech.get('technology', '')} {tech.get('version', '')}" for tech in json_data.get('tech_stack', [])]),
+            owners=', '.join([resp.get('nombre', '') for resp in json_data.get('responsables', [])]),
+            nagios_hosts=len(nagios_meta.get('hosts', [])),
+            nagios_services=len(nagios_meta.get('services', [])),
+            nagios_contacts=len(nagios_meta.get('contacts', [])),
+            logs_count=len(json_data.get('logs', [])),
+            elastic_alerts=len(elastic_meta.get('alerts', [])),
+            centralized_logs=json_data.get('centralized_logs', 'No especificado')
+        )]
+
+        if 'nagios' in metadata and (output_dir / "nagios").exists():
+            parts.append(_REPORT_NAGIOS_FILES.format(
+                hosts=len(metadata['nagios']['hosts']),
+                services=len(metadata['nagios']['services']),
+                contacts=len(metadata['nagios']['contacts'])
+            ))
 
         if 'elastic' in metadata:
-            elastic_dir = output_dir / "elastic"
-            if elastic_dir.exists():
-                report_content += """
-- `filebeat.yml` - Configuración de Filebeat
-- `logstash.conf` - Configuración de Logstash
-- `ingest_pipeline.json` - Pipeline de procesamiento
-- `index_template.json` - Template de índices
-- `kibana_dashboard.json` - Dashboard básico
-- `alerts.json` - Configuración de alertas
-"""
-
-        report_content += """
-
-## Dependencias Configuradas
-
-"""
+            parts.append("\n### Elastic Stack\n")
+            if (output_dir / "elastic").exists():
+                parts.append(_REPORT_ELASTIC_FILES)
+        else:
+            parts.append("\n### Elastic Stack (No generado)\n")
 
+        parts.append("\n\n## Dependencias Configuradas\n\n")
         for dep in json_data.get('dependencies', []):
-            report_content += f"""- **{dep.get('name', 'N/A')}**
-  - Tipo: {dep.get('type', 'N/A')}
-  - Impacto: {dep.get('impact', 'N/A')}
-  - Puerto: {dep.get('port', 'N/A')}
-  - Protocolo: {dep.get('check_protocol', 'N/A')}
-  - Efecto: {dep.get('effect', 'N/A')}
-
-"""
-
-        report_content += """
-
-## Logs Configurados
-
-"""
-
+            parts.append(_REPORT_DEPENDENCY.format(
+                name=dep.get('name', 'N/A'),
+                type=dep.get('type', 'N/A'),
+                impact=dep.get('impact', 'N/A'),
+                port=dep.get('port', 'N/A'),
+                protocol=dep.get('check_protocol', 'N/A'),
+                effect=dep.get('effect', 'N/A')
+            ))
+
+        parts.append("\n\n## Logs Configurados\n\n")
         for log in json_data.get('logs', []):
-            report_content += f"""- **{log.get('name', 'N/A')}**
-  - Ruta: {log.get('path', 'N/A')}
-  - Formato: {log.get('format', 'N/A')}
-  - Retención: {log.get('retention_value', 'N/A')}
-  - Patrones: {', '.join(log.get('patterns', []))}
-
-"""
+            parts.append(_REPORT_LOG.format(
+                name=log.get('name', 'N/A'),
+                path=log.get('path', 'N/A'),
+                format=log.get('format', 'N/A'),
+                retention=log.get('retention_value', 'N/A'),
+                patterns=', '.join(log.get('patterns', []))
+            ))
 
         # Instrucciones de despliegue
-        report_content += """
-## Instrucciones de Despliegue
+        parts.append(_REPORT_FOOTER)
 
-### Nagios
-1. Copiar los archivos `.cfg` a `/etc/nagios/objects/`
-2. Reiniciar servicio Nagios: `systemctl restart nagios`
-3. Verificar configuración: `nagios -v /etc/nagios/nagios.cfg`
-
-### Elastic Stack
-1. **Filebeat:** Copiar `filebeat.yml` a `/etc/filebeat/`
-2. **Logstash:** Copiar `logstash.conf` a `/etc/logstash/conf.d/`
-3. **Elasticsearch:** Crear el pipeline y template usando las APIs
-4. **Kibana:** Importar el dashboard y configurar las alertas
-
-## Notas Adicionales
-- Verificar que todas las rutas de logs sean accesibles
-- Ajustar permisos de archivos según sea necesario
-- Probar la configuración en ambiente de desarrollo primero
-"""
-
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        report_file.write_text("".join(parts), encoding='utf-8')
 
         self.logger.info(f"Reporte generado: {report_file}")
 
@@ -394,6 +471,12 @@ Ejemplos de uso:
         help='Entorno para despliegue automático (por defecto: production)'
     )
 
+    parser.add_argument(
+        '--skip-discovery-if-unchanged',
+        action='store_true',
+        help='Omitir la auto-detección de servicios si el JSON de entrada no cambió desde la última ejecución'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
@@ -408,7 +491,10 @@ Ejemplos de uso:
         sys.exit(1)
 
     # Crear automatizador y generar configuraciones
-    automator = MonitoringAutomator(args.output_dir)
+    automator = MonitoringAutomator(
+        args.output_dir,
+        skip_discovery_if_unchanged=args.skip_discovery_if_unchanged
+    )
 
     try:
         success = automator.generate_monitoring_configs(
@@ -4,12 +4,191 @@ Nagios Configuration Generator
 Genera configuraciones de Nagios basadas en el JSON del formulario de monitorización
 """
 
+import io
 import json
 import os
 import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
-from jinja2 import Template
-from plugins.check_manager import check_manager
+from urllib.parse import urlsplit
+from plugins.check_manager import get_check_manager
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Tamaño del buffer de escritura de los archivos .cfg generados
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Formatos de los objetos Nagios generados (host, contacto, servicio y contactgroup)
+_HOST_FMT = """
+define host {{
+    host_name                    {h.host_id}
+    alias                        {h.alias}
+    address                      {h.address}
+    check_period                 24x7
+    check_interval               {h.check_interval}
+    retry_interval               {h.retry_interval}
+    max_check_attempts           {h.max_check_attempts}
+    check_command                check_host_alive
+    notification_interval        60
+    notification_period          24x7
+    notifications_enabled        1
+    register                     1
+}}"""
+
+_CONTACT_FMT = """
+define contact {{
+    contact_name                 {c.contact_name}
+    alias                        {c.contact_name}
+    email                        {c.email}
+    service_notification_period  {c.service_notification_period}
+    host_notification_period     {c.host_notification_period}
+    service_notification_options {c.service_notification_options}
+    host_notification_options    {c.host_notification_options}
+    service_notification_commands {c.service_notification_commands}
+    host_notification_commands   {c.host_notification_commands}
+    register                     1
+}}"""
+
+_SERVICE_FMT = """
+define service {{
+    service_description          {s.service_description}
+    host_name                    {s.host_name}
+    check_command                {s.check_command}
+    check_interval               {s.check_interval}
+    retry_interval               {s.retry_interval}
+    max_check_attempts           {s.max_check_attempts}
+    check_period                 24x7
+    notification_interval        {s.notification_interval}
+    notification_period          24x7
+    notifications_enabled        1
+    contact_groups               {s.contact_groups}
+    register                     1
+}}"""
+
+# Comandos estándar de Nagios (bloque estático, se codifica una sola vez)
+_STANDARD_COMMANDS = """
+# Comandos estándar de Nagios
+define command {
+    command_name    check_host_alive
+    command_line    $USER1$/check_ping -H $HOSTADDRESS$ -w 3000.0,80% -c 5000.0,100% -p 5
+}
+
+define command {
+    command_name    check_http
+    command_line    $USER1$/check_http -H $ARG1$ -u $ARG2$
+}
+
+define command {
+    command_name    check_tcp
+    command_line    $USER1$/check_tcp -H $ARG1$ -p $ARG2$
+}
+
+define command {
+    command_name    check_ping
+    command_line    $USER1$/check_ping -H $ARG1$ -w 100.0,20% -c 500.0,60% -p 5
+}
+
+define command {
+    command_name    check_dns
+    command_line    $USER1$/check_dns -H $ARG1$
+}
+
+define command {
+    command_name    check_ldap
+    command_line    $USER1$/check_ldap -H $ARG1$ -p $ARG2$
+}
+
+define command {
+    command_name    check_smtp
+    command_line    $USER1$/check_smtp -H $ARG1$ -p $ARG2$
+}
+
+define command {
+    command_name    check_mysql
+    command_line    $USER1$/check_mysql -H $ARG1$ -P $ARG2$ -u $ARG3$ -p $ARG4$
+}
+
+define command {
+    command_name    notify-host-by-email
+    command_line    /usr/bin/printf "%b" "***** Nagios *****\n\nNotification Type: $NOTIFICATIONTYPE$\nHost: $HOSTNAME$\nState: $HOSTSTATE$\nAddress: $HOSTADDRESS$\nInfo: $HOSTOUTPUT$\n\nDate/Time: $LONGDATETIME$\n" | /usr/bin/mail -s "** $NOTIFICATIONTYPE$ Host Alert: $HOSTNAME$ is $HOSTSTATE$ **" $CONTACTEMAIL$
+}
+
+define command {
+    command_name    notify-service-by-email
+    command_line    /usr/bin/printf "%b" "***** Nagios *****\n\nNotification Type: $NOTIFICATIONTYPE$\nService: $SERVICEDESC$\nHost: $HOSTALIAS$\nAddress: $HOSTADDRESS$\nState: $SERVICESTATE$\n\nDate/Time: $LONGDATETIME$\n\nAdditional Info:\n\n$SERVICEOUTPUT$\n" | /usr/bin/mail -s "** $NOTIFICATIONTYPE$ Service Alert: $HOSTALIAS$/$SERVICEDESC$ is $SERVICESTATE$ **" $CONTACTEMAIL$
+}
+"""
+_STANDARD_COMMANDS_BYTES = _STANDARD_COMMANDS.encode('utf-8')
+
+_CONTACTGROUP_FMT = """
+define contactgroup {{
+    contactgroup_name            {contactgroup_id}
+    alias                        {service_name} Team
+    members                      {members}
+    register                     1
+}}"""
+
+
+@lru_cache(maxsize=None)
+def _slug(text):
+    """Normaliza un nombre para usarlo en identificadores Nagios (minúsculas, espacios a '_')"""
+    return text.lower().replace(' ', '_')
+
+
+@lru_cache(maxsize=None)
+def _host_id(env_name, identifier):
+    """Genera ID único para host (memoizado: se pide desde hosts y desde servicios)"""
+    return f"host_{env_name.lower()}_{identifier.replace('.', '_').replace('-', '_')}"
+
+
+@dataclass(slots=True)
+class HostConfig:
+    """Registro de un host Nagios generado"""
+    host_id: str
+    host_name: str
+    alias: str
+    address: str
+    env_name: str
+    env_desc: str
+    host_type: str
+    check_interval: int = 300
+    retry_interval: int = 60
+    max_check_attempts: int = 3
+
+
+@dataclass(slots=True)
+class ContactConfig:
+    """Registro de un contacto Nagios generado"""
+    contact_id: str
+    contact_name: str
+    email: str
+    service_notification_period: str = "24x7"
+    host_notification_period: str = "24x7"
+    service_notification_options: str = "w,u,c,r,f,s"
+    host_notification_options: str = "d,u,r,f,s"
+    service_notification_commands: str = "notify-service-by-email"
+    host_notification_commands: str = "notify-host-by-email"
+
+
+@dataclass(slots=True)
+class ServiceConfig:
+    """Registro de un servicio Nagios generado"""
+    service_id: str
+    service_description: str
+    host_name: str
+    check_command: str
+    check_interval: int
+    retry_interval: int
+    max_check_attempts: int
+    contact_groups: str
+    notification_interval: int = 60
 
 
 class NagiosConfigGenerator:
@@ -17,7 +196,9 @@ class NagiosConfigGenerator:
 
     def __init__(self, json_data, output_dir="output/nagios"):
         self.data = json_data
+        self.identification = json_data.get("identification", {})
         self.output_dir = output_dir
+        self._generated_at = datetime.now().isoformat(sep=' ', timespec='seconds')
         self.templates_dir = "templates/nagios"
         self.logger = logging.getLogger('NagiosGenerator')
 
@@ -34,7 +215,7 @@ class NagiosConfigGenerator:
         }
 
         # Usar check_manager para protocolos extensibles
-        self.check_manager = check_manager
+        self.check_manager = get_check_manager()
         self.logger.debug("NagiosConfigGenerator inicializado")
 
     def _get_priority_config(self, priority):
@@ -43,159 +224,189 @@ class NagiosConfigGenerator:
 
     def _generate_host_id(self, env_name, host_type, host_id):
         """Genera ID único para host"""
-        return f"host_{env_name.lower()}_{host_id.replace('.', '_').replace('-', '_')}"
+        return _host_id(env_name, host_id)
 
     def _generate_service_id(self, service_name, dep_name, env_name):
         """Genera ID único para servicio"""
-        return f"svc_{service_name.lower().replace(' ', '_')}_{dep_name.lower().replace(' ', '_')}_{env_name.lower()}"
+        return f"svc_{_slug(service_name)}_{_slug(dep_name)}_{env_name.lower()}"
+
+    def _output_path(self, filename):
+        """Ruta final de un archivo de salida"""
+        return os.path.join(self.output_dir, filename)
+
+    def _open_output(self, filename):
+        """Abre un archivo de salida con un buffer amplio para escritura incremental"""
+        return open(self._output_path(filename), 'w', encoding='utf-8', buffering=_OUTPUT_BUFFER_SIZE)
+
+    def _write_blocks(self, filename, blocks):
+        """Escribe una lista de bloques de bytes en un archivo con el mínimo de llamadas al sistema"""
+        fd = os.open(self._output_path(filename),
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            pending = [memoryview(block) for block in blocks if block]
+            while pending:
+                # os.writev (scatter-gather) no existe en Windows
+                written = os.writev(fd, pending) if hasattr(os, 'writev') else os.write(fd, pending[0])
+                while pending and written >= len(pending[0]):
+                    written -= len(pending[0])
+                    pending.pop(0)
+                if written:
+                    pending[0] = pending[0][written:]
+        finally:
+            os.close(fd)
+
+    def _build_host_index(self):
+        """
+        Precalcula una sola vez, por entorno, el nombre, su forma normalizada, la descripción
+        y los hosts como tuplas (host_id, dirección, tipo, identificador)
+        """
+        host_index = []
+        for env in self.data.get("envs", []):
+            env_name = env.get("name", "unknown")
+            hosts = []
+            for host in env.get("hosts", []):
+                host_type = host.get("type", "host")
+                identifier = host.get("identifier", "")
+                hosts.append((self._generate_host_id(env_name, host_type, identifier),
+                              host.get("address", identifier), host_type, identifier))
+            host_index.append((env_name, env_name.lower(), env.get("desc", ""), tuple(hosts)))
+        return host_index
+
+    def generate_hosts_config(self, out=None, host_index=None):
+        """
+        Genera configuración de hosts basada en entornos, escribiéndola en `out`
+
+        Sin `out` retorna (configuración, hosts como dicts), como en versiones anteriores
+        """
+        if out is None:
+            return self._generate_to_string(self.generate_hosts_config, host_index)
 
-    def generate_hosts_config(self):
-        """Genera configuración de hosts basada en entornos"""
         self.logger.info("Generando configuración de hosts...")
-        hosts_config = []
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         hosts_data = []
 
-        envs = self.data.get("envs", [])
-        self.logger.debug(f"Procesando {len(envs)} entornos para hosts")
+        if host_index is None:
+            host_index = self._build_host_index()
+        self.logger.debug(f"Procesando {len(host_index)} entornos para hosts")
 
-        for env in envs:
-            env_name = env.get("name", "unknown")
-            env_desc = env.get("desc", "")
-            hosts_in_env = env.get("hosts", [])
-            self.logger.debug(f"Entorno {env_name}: {len(hosts_in_env)} hosts")
-
-            for host in hosts_in_env:
-                host_id = self._generate_host_id(env_name, host.get("type", "host"), host.get("identifier", ""))
-                host_address = host.get("address", host.get("identifier", ""))
-
-                # Determinar dirección basada en tipo de host
-                if host.get("type") == "container":
-                    # Para contenedores, usar nombre del contenedor como alias
-                    host_alias = f"{env_name} - {host.get('identifier', '')}"
-                elif host.get("type") == "domain":
-                    host_address = host.get("address", host.get("identifier", ""))
-                    host_alias = f"{env_name} - {host_address}"
+        for env_name, _, env_desc, hosts in host_index:
+            if debug:
+                self.logger.debug("Entorno %s: %d hosts", env_name, len(hosts))
+
+            for host_id, host_address, host_type, identifier in hosts:
+                # Para contenedores, usar nombre del contenedor como alias
+                if host_type == "container":
+                    host_alias = f"{env_name} - {identifier}"
                 else:
                     host_alias = f"{env_name} - {host_address}"
 
-                host_config = {
-                    "host_id": host_id,
-                    "host_name": host_id,
-                    "alias": host_alias,
-                    "address": host_address,
-                    "env_name": env_name,
-                    "env_desc": env_desc,
-                    "host_type": host.get("type", "host"),
-                    "check_interval": 300,
-                    "retry_interval": 60,
-                    "max_check_attempts": 3
-                }
+                host_config = HostConfig(host_id, host_id, host_alias, host_address,
+                                         env_name, env_desc, host_type)
+
+                if hosts_data:
+                    out.write("\n")
+                out.write(_HOST_FMT.format(h=host_config))
 
                 hosts_data.append(host_config)
-                self.logger.debug(f"Host configurado: {host_id} ({host_address})")
-
-                # Template para configuración de host
-                host_template = Template("""
-define host {
-    host_name                    {{ host_id }}
-    alias                        {{ alias }}
-    address                      {{ address }}
-    check_period                 24x7
-    check_interval               {{ check_interval }}
-    retry_interval               {{ retry_interval }}
-    max_check_attempts           {{ max_check_attempts }}
-    check_command                check_host_alive
-    notification_interval        60
-    notification_period          24x7
-    notifications_enabled        1
-    register                     1
-}
-""")
-                hosts_config.append(host_template.render(**host_config))
+                if debug:
+                    self.logger.debug("Host configurado: %s (%s)", host_id, host_address)
 
         self.logger.info(f"Configuración de hosts generada: {len(hosts_data)} hosts")
-        return "\n".join(hosts_config), hosts_data
+        return hosts_data
+
+    def generate_contacts_config(self, out=None):
+        """
+        Genera configuración de contactos basada en responsables, escribiéndola en `out`
+
+        Sin `out` retorna (configuración, contactos como dicts), como en versiones anteriores
+        """
+        if out is None:
+            return self._generate_to_string(self.generate_contacts_config)
 
-    def generate_contacts_config(self):
-        """Genera configuración de contactos basada en responsables"""
         self.logger.info("Generando configuración de contactos...")
-        contacts_config = []
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         contacts_data = []
 
         responsables = self.data.get("responsables", [])
         self.logger.debug(f"Procesando {len(responsables)} responsables")
 
         for resp in responsables:
-            contact_id = f"contact_{resp.get('nombre', '').lower().replace(' ', '_')}"
+            contact_id = f"contact_{_slug(resp.get('nombre', ''))}"
             contact_name = resp.get("nombre", "")
             contact_email = resp.get("email", "")
-            self.logger.debug(f"Contacto: {contact_name} <{contact_email}>")
-
-            contact_config = {
-                "contact_id": contact_id,
-                "contact_name": contact_name,
-                "email": contact_email,
-                "service_notification_period": "24x7",
-                "host_notification_period": "24x7",
-                "service_notification_options": "w,u,c,r,f,s",
-                "host_notification_options": "d,u,r,f,s",
-                "service_notification_commands": "notify-service-by-email",
-                "host_notification_commands": "notify-host-by-email"
-            }
+            if debug:
+                self.logger.debug("Contacto: %s <%s>", contact_name, contact_email)
 
-            contacts_data.append(contact_config)
+            contact_config = ContactConfig(contact_id, contact_name, contact_email)
 
-            # Template para configuración de contacto
-            contact_template = Template("""
-define contact {
-    contact_name                 {{ contact_name }}
-    alias                        {{ contact_name }}
-    email                        {{ email }}
-    service_notification_period  {{ service_notification_period }}
-    host_notification_period     {{ host_notification_period }}
-    service_notification_options {{ service_notification_options }}
-    host_notification_options    {{ host_notification_options }}
-    service_notification_commands {{ service_notification_commands }}
-    host_notification_commands   {{ host_notification_commands }}
-    register                     1
-}
-""")
-            contacts_config.append(contact_template.render(**contact_config))
+            if contacts_data:
+                out.write("\n")
+            out.write(_CONTACT_FMT.format(c=contact_config))
+
+            contacts_data.append(contact_config)
 
         # Crear contactgroup para el servicio
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
-        contactgroup_id = f"cg_{service_name.lower().replace(' ', '_')}"
+        service_name = self.identification.get("service_name", "unknown")
+        contactgroup_id = f"cg_{_slug(service_name)}"
         self.logger.debug(f"Contactgroup creado: {contactgroup_id}")
 
-        contactgroup_template = Template("""
-define contactgroup {
-    contactgroup_name            {{ contactgroup_id }}
-    alias                        {{ service_name }} Team
-    members                      {% for contact in contacts_data %}{{ contact.contact_id }}{% if not loop.last %},{% endif %}{% endfor %}
-    register                     1
-}
-""")
-
-        contacts_config.append(contactgroup_template.render(
+        if contacts_data:
+            out.write("\n")
+        out.write(_CONTACTGROUP_FMT.format(
             contactgroup_id=contactgroup_id,
             service_name=service_name,
-            contacts_data=contacts_data
+            members=",".join(c.contact_id for c in contacts_data)
         ))
 
         self.logger.info(f"Configuración de contactos generada: {len(contacts_data)} contactos")
-        return "\n".join(contacts_config), contacts_data
+        return contacts_data
+
+    def _write_service(self, out, services_data, service_config, host_ids=None):
+        """Escribe la definición de un servicio en `out` y la registra en `services_data`
+
+        Si se indican `host_ids`, la definición agrupa varios hosts y se registra un
+        servicio por host, de forma que `services_data` siga contando checks.
+        """
+        if services_data:
+            out.write("\n")
+        out.write(_SERVICE_FMT.format(s=service_config))
+        if host_ids is None:
+            services_data.append(service_config)
+        else:
+            services_data.extend(replace(service_config, host_name=host_id) for host_id in host_ids)
+
+    def generate_services_config(self, out=None, host_index=None):
+        """
+        Genera configuración de servicios basada en dependencias, escribiéndola en `out`
+
+        Sin `out` retorna (configuración, servicios como dicts), como en versiones anteriores
+        """
+        if out is None:
+            return self._generate_to_string(self.generate_services_config, host_index)
 
-    def generate_services_config(self):
-        """Genera configuración de servicios basada en dependencias"""
         self.logger.info("Generando configuración de servicios...")
-        services_config = []
+        # Evitar llamadas al logger por registro cuando DEBUG no está activo
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         services_data = []
 
-        service_name = self.data.get("identification", {}).get("service_name", "unknown")
-        priority = self.data.get("identification", {}).get("priority", "Media")
-        priority_config = self._get_priority_config(priority)
+        service_name = self.identification.get("service_name", "unknown")
+        priority = self.identification.get("priority", "Media")
         self.logger.debug(f"Servicio: {service_name}, Prioridad: {priority}")
 
+        # Valores invariantes durante toda la generación de servicios
+        service_slug = _slug(service_name)
+        contact_group = f"cg_{service_slug}"
+
+        if host_index is None:
+            host_index = self._build_host_index()
+
+        # (interval, retry, max_attempts) por nivel de impacto, desempaquetados una sola vez
+        impact_values = {
+            impact: (config["interval"], config["retry"], config["max_attempts"])
+            for impact, config in self.priority_mapping.items()
+        }
+        default_impact_values = impact_values["Media"]
+
         dependencies = self.data.get("dependencies", [])
         self.logger.debug(f"Procesando {len(dependencies)} dependencias")
 
@@ -206,43 +417,34 @@ define contactgroup {
             interval = health_details.get("interval_sec", 300)
             self.logger.info(f"Configurando Health API: {endpoint} (intervalo: {interval}s)")
 
-            for env in self.data.get("envs", []):
-                env_name = env.get("name", "")
-
-                service_id = f"svc_health_{service_name.lower().replace(' ', '_')}_{env_name.lower()}"
-
-                service_config = {
-                    "service_id": service_id,
-                    "service_description": f"Health Check - {service_name}",
-                    "host_name": "*",  # Aplicar a todos los hosts del servicio
-                    "check_command": f"check_http -H {endpoint.replace('http://', '').replace('https://', '').split('/')[0]} -u {endpoint}",
-                    "check_interval": interval,
-                    "retry_interval": 60,
-                    "max_check_attempts": 3,
-                    "notification_interval": 60,
-                    "contact_groups": f"cg_{service_name.lower().replace(' ', '_')}"
-                }
-
-                services_data.append(service_config)
-                self.logger.debug(f"Servicio Health API creado: {service_id}")
-
-                service_template = Template("""
-define service {
-    service_description          {{ service_description }}
-    host_name                    {{ host_name }}
-    check_command                {{ check_command }}
-    check_interval               {{ check_interval }}
-    retry_interval               {{ retry_interval }}
-    max_check_attempts           {{ max_check_attempts }}
-    check_period                 24x7
-    notification_interval        {{ notification_interval }}
-    notification_period          24x7
-    notifications_enabled        1
-    contact_groups               {{ contact_groups }}
-    register                     1
-}
-""")
-                services_config.append(service_template.render(**service_config))
+            # Extraer host y puerto del endpoint una sola vez para todos los entornos
+            health_url = urlsplit(endpoint)
+            if not health_url.netloc:
+                # Endpoint sin esquema (p. ej. "host:8000/health"): interpretarlo como red
+                health_url = urlsplit(f"//{endpoint}")
+            health_target = health_url.hostname or endpoint
+            try:
+                if health_url.port:
+                    health_target = f"{health_target} -p {health_url.port}"
+            except ValueError:
+                self.logger.warning(f"Puerto no válido en el endpoint de Health API: {endpoint}")
+            health_command = f"check_http -H {health_target} -u {endpoint}"
+
+            for _, env_slug, _, _ in host_index:
+                service_id = f"svc_health_{service_slug}_{env_slug}"
+
+                service_config = ServiceConfig(
+                    service_id,
+                    f"Health Check - {service_name}",
+                    "*",  # Aplicar a todos los hosts del servicio
+                    health_command,
+                    interval, 60, 3,
+                    contact_group
+                )
+
+                self._write_service(out, services_data, service_config)
+                if debug:
+                    self.logger.debug("Servicio Health API creado: %s", service_id)
 
         # Crear servicios para cada dependencia
         for dep in dependencies:
@@ -250,7 +452,8 @@ define service {
             dep_port = dep.get("port", "")
             dep_protocol = dep.get("check_protocol", "tcp")
             dep_impact = dep.get("impact", "Media")
-            self.logger.debug(f"Dependencia: {dep_name} ({dep_protocol}, impacto: {dep_impact})")
+            if debug:
+                self.logger.debug("Dependencia: %s (%s, impacto: %s)", dep_name, dep_protocol, dep_impact)
 
             # Para Docker checks, si no hay puerto, usar check_params para container_name
             if dep_protocol == "docker" and not dep_port:
@@ -262,137 +465,90 @@ define service {
                 self.logger.warning(f"Dependencia '{dep_name}' sin puerto definido, saltando...")
                 continue
 
-            impact_config = self._get_priority_config(dep_impact)
-
-            for env in self.data.get("envs", []):
-                env_name = env.get("name", "")
-                hosts_in_env = env.get("hosts", [])
-                self.logger.debug(f"Entorno {env_name}: {len(hosts_in_env)} hosts")
-
-                # Crear servicio para cada host en el entorno
-                for host in hosts_in_env:
-                    host_id = self._generate_host_id(env_name, host.get("type", "host"), host.get("identifier", ""))
-
-                    service_id = self._generate_service_id(service_name, dep_name, env_name)
-
-                    # Usar check_manager para generar comando
-                    host_address = host.get("address", host.get("identifier", ""))
-                    check_command = self.check_manager.get_nagios_command(dep, host_address)
-                    self.logger.debug(f"Comando generado para {dep_name}: {check_command}")
-
-                    service_config = {
-                        "service_id": service_id,
-                        "service_description": f"{dep_name} ({dep_protocol.upper()})",
-                        "host_name": host_id,
-                        "check_command": check_command,
-                        "check_interval": impact_config["interval"],
-                        "retry_interval": impact_config["retry"],
-                        "max_check_attempts": impact_config["max_attempts"],
-                        "notification_interval": 60,
-                        "contact_groups": f"cg_{service_name.lower().replace(' ', '_')}"
-                    }
-
-                    services_data.append(service_config)
-                    self.logger.debug(f"Servicio creado: {service_id} en host {host_id}")
-
-                    service_template = Template("""
-define service {
-    service_description          {{ service_description }}
-    host_name                    {{ host_name }}
-    check_command                {{ check_command }}
-    check_interval               {{ check_interval }}
-    retry_interval               {{ retry_interval }}
-    max_check_attempts           {{ max_check_attempts }}
-    check_period                 24x7
-    notification_interval        {{ notification_interval }}
-    notification_period          24x7
-    notifications_enabled        1
-    contact_groups               {{ contact_groups }}
-    register                     1
-}
-""")
-                    services_config.append(service_template.render(**service_config))
+            check_interval, retry_interval, max_attempts = impact_values.get(dep_impact, default_impact_values)
+            service_description = f"{dep_name} ({dep_protocol.upper()})"
+
+            # Resolver el check del protocolo una sola vez por dependencia
+            build_command = self.check_manager.get_command_builder(dep)
+            # Comandos ya generados para esta dependencia por dirección de host
+            commands_by_address = {}
+
+            service_id_prefix = f"svc_{service_slug}_{_slug(dep_name)}_"
+
+            for env_name, env_slug, _, hosts in host_index:
+                if debug:
+                    self.logger.debug("Entorno %s: %d hosts", env_name, len(hosts))
+
+                service_id = service_id_prefix + env_slug
+
+                # Agrupar los hosts del entorno que comparten el mismo comando de check
+                # (dict como conjunto ordenado para no repetir hosts duplicados)
+                hosts_by_command = {}
+                for host_id, host_address, _, _ in hosts:
+                    check_command = commands_by_address.get(host_address)
+                    if check_command is None:
+                        check_command = commands_by_address[host_address] = build_command(host_address)
+                        if debug:
+                            self.logger.debug("Comando generado para %s: %s", dep_name, check_command)
+
+                    host_ids = hosts_by_command.get(check_command)
+                    if host_ids is None:
+                        hosts_by_command[check_command] = {host_id: None}
+                    else:
+                        host_ids[host_id] = None
+
+                # Un único servicio por comando, aplicado a todos sus hosts
+                for check_command, host_ids in hosts_by_command.items():
+                    host_names = ",".join(host_ids)
+                    service_config = ServiceConfig(
+                        service_id, service_description, host_names, check_command,
+                        check_interval, retry_interval, max_attempts, contact_group
+                    )
+
+                    self._write_service(out, services_data, service_config, host_ids)
+                    if debug:
+                        self.logger.debug("Servicio creado: %s en hosts %s", service_id, host_names)
 
         self.logger.info(f"Configuración de servicios generada: {len(services_data)} servicios")
-        return "\n".join(services_config), services_data
+        return services_data
 
     def generate_commands_config(self):
         """Genera configuración de comandos personalizados"""
-        commands_config = []
-
-        # Comandos estándar de Nagios
-        standard_commands = """
-# Comandos estándar de Nagios
-define command {
-    command_name    check_host_alive
-    command_line    $USER1$/check_ping -H $HOSTADDRESS$ -w 3000.0,80% -c 5000.0,100% -p 5
-}
-
-define command {
-    command_name    check_http
-    command_line    $USER1$/check_http -H $ARG1$ -u $ARG2$
-}
-
-define command {
-    command_name    check_tcp
-    command_line    $USER1$/check_tcp -H $ARG1$ -p $ARG2$
-}
-
-define command {
-    command_name    check_ping
-    command_line    $USER1$/check_ping -H $ARG1$ -w 100.0,20% -c 500.0,60% -p 5
-}
+        return _STANDARD_COMMANDS
 
-define command {
-    command_name    check_dns
-    command_line    $USER1$/check_dns -H $ARG1$
-}
+    def _generate_to_string(self, generate, *args):
+        """Ejecuta un generador en memoria y retorna (texto generado, registros como dicts)"""
+        out = io.StringIO()
+        records = generate(out, *args)
+        return out.getvalue(), [asdict(record) for record in records]
 
-define command {
-    command_name    check_ldap
-    command_line    $USER1$/check_ldap -H $ARG1$ -p $ARG2$
-}
-
-define command {
-    command_name    check_smtp
-    command_line    $USER1$/check_smtp -H $ARG1$ -p $ARG2$
-}
-
-define command {
-    command_name    check_mysql
-    command_line    $USER1$/check_mysql -H $ARG1$ -P $ARG2$ -u $ARG3$ -p $ARG4$
-}
-
-define command {
-    command_name    notify-host-by-email
-    command_line    /usr/bin/printf "%b" "***** Nagios *****\n\nNotification Type: $NOTIFICATIONTYPE$\nHost: $HOSTNAME$\nState: $HOSTSTATE$\nAddress: $HOSTADDRESS$\nInfo: $HOSTOUTPUT$\n\nDate/Time: $LONGDATETIME$\n" | /usr/bin/mail -s "** $NOTIFICATIONTYPE$ Host Alert: $HOSTNAME$ is $HOSTSTATE$ **" $CONTACTEMAIL$
-}
-
-define command {
-    command_name    notify-service-by-email
-    command_line    /usr/bin/printf "%b" "***** Nagios *****\n\nNotification Type: $NOTIFICATIONTYPE$\nService: $SERVICEDESC$\nHost: $HOSTALIAS$\nAddress: $HOSTADDRESS$\nState: $SERVICESTATE$\n\nDate/Time: $LONGDATETIME$\n\nAdditional Info:\n\n$SERVICEOUTPUT$\n" | /usr/bin/mail -s "** $NOTIFICATIONTYPE$ Service Alert: $HOSTALIAS$/$SERVICEDESC$ is $SERVICESTATE$ **" $CONTACTEMAIL$
-}
-"""
-
-        commands_config.append(standard_commands)
-        return "\n".join(commands_config)
+    def _generate_to_file(self, filename, generate, *args):
+        """Ejecuta un generador escribiendo su salida en `filename` y devuelve sus datos"""
+        with self._open_output(filename) as f:
+            return generate(f, *args)
 
     def generate_all_configs(self):
         """Genera todas las configuraciones de Nagios"""
         self.logger.info("Generando todas las configuraciones de Nagios...")
 
-        # Generar cada tipo de configuración
-        hosts_cfg, hosts_data = self.generate_hosts_config()
-        contacts_cfg, contacts_data = self.generate_contacts_config()
-        services_cfg, services_data = self.generate_services_config()
-        commands_cfg = self.generate_commands_config()
+        # Índice de hosts compartido por la generación de hosts y de servicios
+        host_index = self._build_host_index()
+
+        # Generar hosts, contactos y servicios en paralelo, cada uno sobre su propio archivo
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            hosts_future = executor.submit(self._generate_to_file, "hosts.cfg", self.generate_hosts_config, host_index)
+            contacts_future = executor.submit(self._generate_to_file, "contacts.cfg", self.generate_contacts_config)
+            services_future = executor.submit(self._generate_to_file, "services.cfg", self.generate_services_config, host_index)
+            hosts_data = hosts_future.result()
+            contacts_data = contacts_future.result()
+            services_data = services_future.result()
 
         # Crear configuración principal de Nagios
-        service_name = self.data.get('identification', {}).get('service_name', 'Unknown')
+        service_name = self.identification.get('service_name', 'Unknown')
         main_cfg = f"""
 # Configuración de Nagios generada automáticamente
 # Servicio: {service_name}
-# Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+# Fecha de generación: {self._generated_at}
 # Archivo generado por el sistema de automatización de monitorización
 
 # Configuración principal
@@ -405,27 +561,21 @@ cfg_file=/etc/nagios/objects/contacts.cfg
 cfg_file=/etc/nagios/objects/commands.cfg
 """
 
-        # Guardar archivos individuales
-        files_to_save = [
-            ("hosts.cfg", hosts_cfg),
-            ("services.cfg", services_cfg),
-            ("contacts.cfg", contacts_cfg),
-            ("commands.cfg", commands_cfg),
-            ("nagios.cfg", main_cfg)
-        ]
+        # Guardar archivos restantes
+        self._write_blocks("commands.cfg", [_STANDARD_COMMANDS_BYTES])
+        self._write_blocks("nagios.cfg", [main_cfg.encode('utf-8')])
 
         saved_files = []
-        for filename, content in files_to_save:
-            filepath = os.path.join(self.output_dir, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+        for filename in ("hosts.cfg", "services.cfg", "contacts.cfg", "commands.cfg", "nagios.cfg"):
+            filepath = self._output_path(filename)
             saved_files.append(filepath)
             self.logger.info(f"Archivo generado: {filepath}")
 
+        # Los registros se exponen como dicts, igual que en versiones anteriores
         metadata = {
-            "hosts": hosts_data,
-            "contacts": contacts_data,
-            "services": services_data
+            "hosts": [asdict(host) for host in hosts_data],
+            "contacts": [asdict(contact) for contact in contacts_data],
+            "services": [asdict(service) for service in services_data]
         }
 
         self.logger.info(f"Configuración de Nagios completada: {len(saved_files)} archivos, {len(hosts_data)} hosts, {len(services_data)} servicios, {len(contacts_data)} contactos")
@@ -437,8 +587,10 @@ def generate_nagios_from_json(json_file, output_dir="output/nagios"):
     logger = logging.getLogger('NagiosGenerator')
     try:
         logger.info(f"Iniciando generación de configuración Nagios desde: {json_file}")
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        # orjson.JSONDecodeError hereda de json.JSONDecodeError
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
         generator = NagiosConfigGenerator(data, output_dir)
         files, metadata = generator.generate_all_configs()
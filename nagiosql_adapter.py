@@ -5,14 +5,217 @@ Adaptador para integrar configuraciones de Nagios con NagiosQL
 Soporta importación automática de hosts, servicios y comandos vía API REST
 """
 
+import io
 import json
 import logging
+import os
+import shlex
+import smtplib
+import subprocess
+import tempfile
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.message import EmailMessage
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import hashlib
 import re
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import paramiko
+    PARAMIKO_AVAILABLE = True
+except ImportError:
+    PARAMIKO_AVAILABLE = False
+
+try:
+    import mysql.connector
+    MYSQL_AVAILABLE = True
+except ImportError:
+    MYSQL_AVAILABLE = False
+
+# Segundos durante los que se reutiliza la respuesta de un GET idéntico a la API
+_GET_CACHE_TTL = 5.0
+
+# Serialización JSON de la API: orjson si está disponible, json de la stdlib si no.
+# El cuerpo se envía ya codificado (la sesión fija Content-Type: application/json)
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _json_loads = json.loads
+
+# Canales SFTP concurrentes usados para subir archivos al servidor NagiosQL
+_SFTP_WORKERS = 8
+
+# Peticiones concurrentes contra la API REST de NagiosQL
+_API_WORKERS = 32
+
+# Ventana y tamaño máximo de paquete de los canales SFTP: una ventana grande permite
+# mantener más datos en vuelo en enlaces con alto producto ancho de banda-latencia
+_SFTP_WINDOW_SIZE = 2 ** 24
+_SFTP_MAX_PACKET_SIZE = 2 ** 15
+
+# Subdirectorio del directorio de importación con los contenidos direccionados por checksum
+_CAS_DIRNAME = '.cas'
+
+# Algoritmos de checksum soportados: función local y comando remoto equivalente.
+# BLAKE2b con digest de 128 bits es más rápido que MD5; 'md5' se mantiene como
+# fallback para servidores sin b2sum
+_CHECKSUM_ALGORITHMS = {
+    'blake2b': (lambda data: hashlib.blake2b(data, digest_size=16).hexdigest(), 'b2sum -l 128'),
+    'md5': (lambda data: hashlib.md5(data).hexdigest(), 'md5sum'),
+}
+# Algoritmo de los checksums de objetos guardados por versiones anteriores del adaptador
+_LEGACY_CHECKSUM_ALGORITHM = 'md5'
+
+# Apertura de un bloque de configuración de Nagios (línea ya sin espacios en los extremos)
+_DEFINE_RE = re.compile(r'define\s+(\w+)\s*\{$')
+
+
+# Plantillas de valores por defecto de cada tipo de objeto de NagiosQL; definen
+# también los campos (y su orden) de los objetos construidos
+_HOST_DEFAULTS = {
+    'host_name': '',
+    'alias': '',
+    'address': '',
+    'check_command': 'check-host-alive',
+    'check_interval': '300',
+    'retry_interval': '60',
+    'max_check_attempts': '3',
+    'check_period': '24x7',
+    'notification_period': '24x7',
+    'notification_interval': '60',
+    'notifications_enabled': '1',
+    'register': '1'
+}
+_SERVICE_DEFAULTS = {
+    'service_description': '',
+    'host_name': '',
+    'check_command': '',
+    'check_interval': '300',
+    'retry_interval': '60',
+    'max_check_attempts': '3',
+    'check_period': '24x7',
+    'notification_period': '24x7',
+    'notification_interval': '60',
+    'notifications_enabled': '1',
+    'contact_groups': '',
+    'register': '1'
+}
+_COMMAND_DEFAULTS = {
+    'command_name': '',
+    'command_line': '',
+    'register': '1'
+}
+_CONTACT_DEFAULTS = {
+    'contact_name': '',
+    'alias': '',
+    'email': '',
+    'service_notification_period': '24x7',
+    'host_notification_period': '24x7',
+    'service_notification_options': 'w,u,c,r,f,s',
+    'host_notification_options': 'd,u,r,f,s',
+    'service_notification_commands': 'notify-service-by-email',
+    'host_notification_commands': 'notify-host-by-email',
+    'register': '1'
+}
+_CONTACTGROUP_DEFAULTS = {
+    'contactgroup_name': '',
+    'alias': '',
+    'members': '',
+    'register': '1'
+}
+# Campos obligatorios por tipo de objeto para la validación en proceso; el primero identifica el objeto
+_REQUIRED_FIELDS = {
+    'host': ('host_name', 'address'),
+    'service': ('service_description', 'host_name', 'check_command'),
+    'command': ('command_name', 'command_line'),
+    'contact': ('contact_name',),
+    'contactgroup': ('contactgroup_name',)
+}
+# Campos que pueden sustituir a un campo obligatorio (servicios asignados a un hostgroup)
+_FIELD_ALTERNATIVES = {
+    ('service', 'host_name'): ('hostgroup_name',)
+}
+# Valor numérico de un intervalo de Nagios (admite decimales, p. ej. 0.5 con interval_length)
+_NUMBER_RE = re.compile(r'\d+(?:\.\d*)?|\.\d+')
+# Nombre del comando en un check_command (antes de argumentos '!' o parámetros en línea)
+_COMMAND_NAME_RE = re.compile(r'[^!\s]*')
+# Tablas de NagiosQL (y plantilla de columnas) por tipo de objeto para la importación directa
+_DB_TABLES = {
+    'host': ('tbl_host', _HOST_DEFAULTS),
+    'service': ('tbl_service', _SERVICE_DEFAULTS),
+    'command': ('tbl_command', _COMMAND_DEFAULTS),
+    'contact': ('tbl_contact', _CONTACT_DEFAULTS),
+    'contactgroup': ('tbl_contactgroup', _CONTACTGROUP_DEFAULTS)
+}
+# Filas por executemany: acota el tamaño de cada INSERT multi-fila (max_allowed_packet)
+_DB_BATCH_SIZE = 1000
+# Endpoints de la API REST (y plantilla de campos) por tipo de objeto
+_API_ENDPOINTS = {
+    'host': ('hosts', _HOST_DEFAULTS),
+    'service': ('services', _SERVICE_DEFAULTS),
+    'command': ('commands', _COMMAND_DEFAULTS),
+    'contact': ('contacts', _CONTACT_DEFAULTS),
+    'contactgroup': ('contactgroups', _CONTACTGROUP_DEFAULTS)
+}
+# Campos que identifican un objeto de la API con independencia de su contenido (por endpoint)
+_API_IDENTITY_FIELDS = {
+    'hosts': ('host_name',),
+    'services': ('host_name', 'service_description'),
+    'commands': ('command_name',),
+    'contacts': ('contact_name',),
+    'contactgroups': ('contactgroup_name',)
+}
+_INT_FIELDS = ('max_check_attempts',)
+_INTERVAL_FIELDS = ('check_interval', 'retry_interval', 'notification_interval')
+_BOOL_FIELDS = ('notifications_enabled', 'register')
+
+
+def _to_number(value: str):
+    """Convierte un intervalo a número: entero si no tiene parte decimal, float si la tiene"""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _object_identity(object_type: str, obj: Dict) -> Tuple[str, ...]:
+    """Valores de los campos identificadores de un objeto; tupla vacía si el tipo no los define"""
+    return tuple(str(obj.get(field, '')) for field in _API_IDENTITY_FIELDS.get(object_type, ()))
+
+
+@lru_cache(maxsize=8192)
+def _hash_frozen(items: tuple, algorithm: str) -> str:
+    """
+    Checksum de un objeto dado como tupla de pares (clave, valor). La forma canónica es
+    el JSON con claves ordenadas, la misma de las versiones anteriores, de modo que solo
+    el algoritmo cambia el valor; los objetos con los mismos campos (habitual en
+    servicios) se calculan una sola vez
+    """
+    return _CHECKSUM_ALGORITHMS[algorithm][0](json.dumps(dict(items), sort_keys=True).encode())
+
+
+@dataclass(slots=True, frozen=True)
+class StagedFile:
+    """Archivo preparado en el servidor NagiosQL para importación"""
+    filename: str
+    session_path: str
+    import_path: str
+    checksum: str
+
 
 class NagiosQLAdapter:
     """
@@ -50,26 +253,148 @@ class NagiosQLAdapter:
         # Configuración de base de datos (para validación)
         self.db_config = config.get('database', {})
 
+        # Configuración de API REST (versiones de NagiosQL con API): sección 'api' de
+        # config.yml o claves planas (api_url, username, password, verify_ssl)
+        api_config = config.get('api', {})
+        self.base_url = api_config.get('url', config.get('api_url', '')).rstrip('/')
+        self.timeout = api_config.get('timeout', config.get('timeout', 30))
+        self.verify_ssl = api_config.get('verify_ssl', config.get('verify_ssl', True))
+        self.update_existing = config.get('update_existing', True)
+        self._no_bulk = set()  # Tipos de objeto sin endpoint de importación masiva
+        self._checksum_index: Dict[str, Dict[str, str]] = {}  # object_type -> {checksum: id}
+        # object_type -> {identidad: (id, checksum)}, para actualizar objetos modificados
+        self._identity_index: Dict[str, Dict[Tuple[str, ...], Tuple[str, Optional[str]]]] = {}
+        self.session = self._create_http_session(
+            api_config.get('username', config.get('username')),
+            api_config.get('password', config.get('password')),
+            api_config.get('api_key', config.get('api_key'))
+        )
+
         # Método de integración (para v3.5.0: principalmente 'file')
         self.integration_method = config.get('integration_method', 'file')
+        # Importación vía archivos: escribirlos en un directorio temporal en vez de subirlos en memoria
+        self.write_to_disk = config.get('write_to_disk', False)
 
         # Configuración de idempotencia y seguridad
         self.use_checksums = config.get('use_checksums', True)
         self.create_backups = config.get('create_backups', True)
         self.validate_syntax = config.get('validate_syntax', True)
+        self.strict_validate = config.get('strict_validate', False)
+        self.checksum_algorithm = config.get('checksum_algorithm', 'blake2b')
+        if self.checksum_algorithm not in _CHECKSUM_ALGORITHMS:
+            self.logger.warning(f"Algoritmo de checksum no soportado: {self.checksum_algorithm} - usando blake2b")
+            self.checksum_algorithm = 'blake2b'
+        self._hash, self._remote_checksum_command = _CHECKSUM_ALGORITHMS[self.checksum_algorithm]
 
         # Configuración de notificaciones
         self.notifications_enabled = config.get('notifications_enabled', True)
         self.notification_recipients = config.get('notification_recipients', [])
+        self.smtp_config = config.get('smtp', {})
+        self.slack_webhook_url = config.get('slack_webhook_url')
 
         # Estado interno para trazabilidad
         self.import_session_id = None
-        self.staged_files = []
+        self.staged_files: Dict[str, StagedFile] = {}
+        self.skipped_files: List[str] = []  # Archivos sin cambios que no se vuelven a preparar
         self.validation_results = {}
 
+        # Checksums de la última sesión de staging persistidos en un archivo local (sidecar)
+        # y checksums remotos obtenidos en la última verificación de idempotencia (None si
+        # no se pudo verificar el servidor)
+        self._hash_cache_path = os.path.expanduser(config.get('staging_hash_cache', '~/.nagiosql_staging_hashes.json'))
+        self._hash_cache: Dict[str, str] = self._load_hash_cache()
+        self._remote_checksums: Optional[Dict[str, str]] = None
+
+        # Días que se conservan en el CAS remoto los contenidos ya no enlazados
+        self.cas_retention_days = int(config.get('cas_retention_days', 30))
+
+        # Conexión SSH persistente, reutilizada por idempotencia y staging
+        self._ssh = None
+        # Se comprueba una sola vez que el servidor dispone del comando de checksum configurado
+        self._checksum_command_checked = False
+
+        # Digests de conjuntos de configuraciones ya validados con éxito
+        self._validated_digests = set()
+
+        # Caché de parseo por archivo: filename -> (digest del contenido, bloques parseados)
+        self._parse_cache: Dict[str, Tuple[bytes, Dict[str, List[Dict]]]] = {}
+
+        # Caché de GETs a la API: (url, params) -> (instante, status_code, cabeceras, JSON decodificado)
+        self._get_cache: Dict[Tuple[str, frozenset], Tuple[float, int, Any, Any]] = {}
+        # Los workers de importación leen e invalidan la caché de forma concurrente
+        self._get_cache_lock = threading.Lock()
+
         self.logger.info(f"NagiosQL Adapter v3.5.0 inicializado - Método: {self.integration_method}")
         self.logger.info(f"Directorio de importación: {self.import_directory}")
 
+    def __enter__(self) -> 'NagiosQLAdapter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Cierra la conexión SSH persistente si está abierta y la sesión HTTP"""
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+        self.session.close()
+
+    def _create_http_session(self, username: Optional[str], password: Optional[str],
+                             api_key: Optional[str]) -> requests.Session:
+        """
+        Crea la sesión HTTP de la API con un pool de conexiones persistentes del tamaño
+        de las peticiones concurrentes y reintentos ante errores transitorios
+        """
+        session = requests.Session()
+        # Solo se reintentan métodos idempotentes: repetir un POST tras un 502/503/504
+        # puede duplicar objetos, importaciones masivas o exportaciones ya aplicadas
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS
+        )
+        adapter = HTTPAdapter(pool_connections=_API_WORKERS, pool_maxsize=_API_WORKERS, max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive', 'Content-Type': 'application/json'})
+
+        if api_key:
+            session.headers['X-API-Key'] = api_key
+        elif username:
+            session.auth = (username, password)
+
+        return session
+
+    def _conn(self):
+        """
+        Retorna la conexión SSH con el servidor NagiosQL, creándola la primera vez;
+        los comandos remotos y los canales SFTP se multiplexan sobre el mismo transporte
+        """
+        if self._ssh is not None:
+            transport = self._ssh.get_transport()
+            if transport is not None and transport.is_active():
+                return self._ssh
+            self.close()
+
+        if not PARAMIKO_AVAILABLE:
+            raise RuntimeError("paramiko no disponible - instalar con: pip install paramiko")
+
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        ssh.connect(
+            hostname=self.nagiosql_host,
+            username=self.nagiosql_user,
+            key_filename=os.path.expanduser(self.nagiosql_key_path),
+            timeout=10
+        )
+        ssh.get_transport().set_keepalive(30)
+
+        self._ssh = ssh
+        return ssh
+
     def import_configurations(self, config_files: Dict[str, str]) -> bool:
         """
         Importa configuraciones de Nagios a NagiosQL v3.5.0
@@ -91,17 +416,20 @@ class NagiosQLAdapter:
         self.import_session_id = f"nagiosql_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
         try:
+            # Codificar cada archivo una sola vez; validación, checksums y subidas reutilizan los mismos bytes
+            config_data = {filename: content.encode('utf-8') for filename, content in config_files.items()}
+
             # Paso 1: Validación sintáctica previa
-            if self.validate_syntax and not self._validate_nagios_syntax(config_files):
+            if self.validate_syntax and not self._validate_nagios_syntax(config_data):
                 self.logger.error("Validación sintáctica fallida - abortando importación")
                 return False
 
             # Paso 2: Verificación de idempotencia
-            if not self._check_idempotency(config_files):
+            if not self._check_idempotency(config_data):
                 self.logger.warning("Posibles conflictos de idempotencia detectados")
 
             # Paso 3: Staging de archivos
-            if not self._stage_files_for_import(config_files):
+            if not self._stage_files_for_import(config_data):
                 self.logger.error("Error en staging de archivos")
                 return False
 
@@ -114,7 +442,7 @@ class NagiosQLAdapter:
 
             self.logger.info("=== STAGING COMPLETADO - IMPORTACIÓN MANUAL PENDIENTE ===")
             self.logger.info(f"ID de sesión: {self.import_session_id}")
-            self.logger.info(f"Archivos preparados: {len(self.staged_files)}")
+            self.logger.info(f"Archivos preparados: {len(self.staged_files)} (sin cambios omitidos: {len(self.skipped_files)})")
 
             return True
 
@@ -122,26 +450,117 @@ class NagiosQLAdapter:
             self.logger.error(f"Error durante el proceso de importación: {e}")
             return False
 
-    def _validate_nagios_syntax(self, config_files: Dict[str, str]) -> bool:
+    def _validate_nagios_syntax(self, config_data: Dict[str, bytes]) -> bool:
         """
         Valida sintaxis de archivos de configuración de Nagios
 
+        La validación estructural se hace en proceso; `nagios -v` solo se ejecuta
+        con strict_validate. Las configuraciones ya validadas no se revalidan.
+
         Returns:
             bool: True si todos los archivos pasan validación
         """
         self.logger.info("Validando sintaxis de configuraciones Nagios...")
 
+        digest = hashlib.blake2b(digest_size=16)
+        for filename in sorted(config_data):
+            digest.update(filename.encode())
+            digest.update(b'\0')
+            digest.update(config_data[filename])
+            digest.update(b'\0')
+        digest = digest.digest()
+        if digest in self._validated_digests:
+            self.logger.info("✅ Configuraciones sin cambios desde la última validación exitosa")
+            return True
+
+        valid = self._validate_inline(config_data)
+        if valid and self.strict_validate:
+            valid = self._validate_with_nagios(config_data)
+
+        if valid:
+            self._validated_digests.add(digest)
+        return valid
+
+    def _validate_inline(self, config_data: Dict[str, bytes]) -> bool:
+        """
+        Validación estructural en proceso: campos obligatorios y numéricos; las
+        referencias de servicios a hosts, comandos y contactgroups no incluidos en la
+        importación solo generan avisos, ya que pueden existir en NagiosQL. Las plantillas
+        (register 0) y los objetos que heredan de una (use) no exigen campos obligatorios
+
+        Returns:
+            bool: True si no se detectaron errores
+        """
+        blocks = self._collect_blocks(config_data)
+
+        errors = []
+        for block_type, required in _REQUIRED_FIELDS.items():
+            for block in blocks.get(block_type, []):
+                name = block.get(required[0]) or block.get('name', '?')
+                # Los campos que faltan pueden heredarse de la plantilla
+                if block.get('register') != '0' and 'use' not in block:
+                    for field in required:
+                        alternatives = _FIELD_ALTERNATIVES.get((block_type, field), ())
+                        if not block.get(field) and not any(block.get(alt) for alt in alternatives):
+                            errors.append(f"{block_type} sin '{field}': {name}")
+                for field in _INT_FIELDS:
+                    if field in block and not block[field].isdigit():
+                        errors.append(f"{block_type} {name}: '{field}' no es entero ({block[field]})")
+                for field in _INTERVAL_FIELDS:
+                    if field in block and not _NUMBER_RE.fullmatch(block[field]):
+                        errors.append(f"{block_type} {name}: '{field}' no es numérico ({block[field]})")
+
+        # Las referencias solo se comprueban contra los tipos incluidos en esta importación
+        unresolved = {}
+        host_names = {block.get('host_name') for block in blocks.get('host', [])}
+        command_names = {block.get('command_name') for block in blocks.get('command', [])}
+        contactgroup_names = {block.get('contactgroup_name') for block in blocks.get('contactgroup', [])}
+        for block in blocks.get('service', []):
+            service = block.get('service_description', '?')
+            if host_names:
+                for host_name in block.get('host_name', '').split(','):
+                    host_name = host_name.strip()
+                    if host_name and host_name != '*' and not host_name.startswith('!') and host_name not in host_names:
+                        unresolved[f"Servicio '{service}' referencia host no definido: {host_name}"] = None
+            command = _COMMAND_NAME_RE.match(block.get('check_command', '')).group(0)
+            if command_names and command and command not in command_names:
+                unresolved[f"Servicio '{service}' referencia comando no definido: {command}"] = None
+            if contactgroup_names:
+                for group in block.get('contact_groups', '').split(','):
+                    group = group.strip()
+                    if group and group not in contactgroup_names:
+                        unresolved[f"Servicio '{service}' referencia contactgroup no definido: {group}"] = None
+
+        for reference in unresolved:
+            self.logger.warning(f"⚠️  {reference}")
+
+        if errors:
+            self.logger.error("❌ Errores de sintaxis detectados:")
+            for error in errors:
+                self.logger.error(f"  - {error}")
+            self.validation_results['syntax_check'] = 'FAILED'
+            self.validation_results['syntax_errors'] = "\n".join(errors)
+            return False
+
+        self.logger.info("✅ Validación sintáctica exitosa")
+        self.validation_results['syntax_check'] = 'PASSED'
+        return True
+
+    def _validate_with_nagios(self, config_data: Dict[str, bytes]) -> bool:
+        """
+        Valida las configuraciones con `nagios -v` (validación estricta)
+
+        Returns:
+            bool: True si Nagios acepta la configuración
+        """
         try:
             # Crear archivos temporales para validación
-            import tempfile
-            import subprocess
-
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Escribir archivos
-                for filename, content in config_files.items():
+                for filename, data in config_data.items():
                     filepath = os.path.join(temp_dir, filename)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    with open(filepath, 'wb') as f:
+                        f.write(data)
 
                 # Crear nagios.cfg básico para validación
                 nagios_cfg = f"""
@@ -181,56 +600,53 @@ log_file=/tmp/nagios.log
             self.logger.error(f"Error en validación sintáctica: {e}")
             return False
 
-    def _check_idempotency(self, config_files: Dict[str, str]) -> bool:
+    def _check_idempotency(self, config_data: Dict[str, bytes]) -> bool:
         """
         Verifica idempotencia comparando con archivos existentes
 
+        Args:
+            config_data: Diccionario con nombre_archivo: contenido codificado en UTF-8
+
         Returns:
             bool: True si no hay conflictos de idempotencia
         """
         self.logger.info("Verificando idempotencia...")
+        self._remote_checksums = None
 
         try:
-            import paramiko
+            # Conexión SSH compartida con el servidor NagiosQL
+            ssh = self._conn()
+            self._ensure_remote_checksum_command(ssh)
+
+            # Checksums locales con el algoritmo ya confirmado en el servidor
+            local_checksums = {
+                filename: self._hash(data)
+                for filename, data in config_data.items()
+            }
 
-            # Conectar por SSH al servidor NagiosQL
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            # Obtener los checksums remotos de todos los archivos en una única llamada, aunque
+            # coincidan con el manifiesto local: pueden haberse borrado o editado en el servidor.
+            # Los archivos inexistentes simplemente no aparecen en la salida
+            remote_paths = {os.path.join(self.import_directory, filename): filename for filename in local_checksums}
+            remote_checksums = {
+                remote_paths[path]: checksum
+                for path, checksum in self._remote_file_checksums(ssh, list(remote_paths)).items()
+            }
 
-            ssh.connect(
-                hostname=self.nagiosql_host,
-                username=self.nagiosql_user,
-                key_filename=os.path.expanduser(self.nagiosql_key_path),
-                timeout=10
-            )
+            self._remote_checksums = remote_checksums
 
             conflicts = []
-            for filename, content in config_files.items():
-                remote_path = os.path.join(self.import_directory, filename)
-
-                # Verificar si archivo existe remotamente
-                stdin, stdout, stderr = ssh.exec_command(f"test -f {remote_path} && echo 'exists' || echo 'not_exists'")
-                exists = stdout.read().decode().strip() == 'exists'
-
-                if exists:
-                    # Comparar checksums
-                    local_checksum = hashlib.md5(content.encode()).hexdigest()
-
-                    # Obtener checksum remoto
-                    stdin, stdout, stderr = ssh.exec_command(f"md5sum {remote_path} | cut -d' ' -f1")
-                    remote_checksum = stdout.read().decode().strip()
-
-                    if local_checksum != remote_checksum:
-                        conflicts.append({
-                            'file': filename,
-                            'status': 'MODIFIED',
-                            'local_checksum': local_checksum,
-                            'remote_checksum': remote_checksum
-                        })
-                    else:
-                        self.logger.debug(f"Archivo {filename} sin cambios")
-
-            ssh.close()
+            for filename, remote_checksum in remote_checksums.items():
+                local_checksum = local_checksums[filename]
+                if local_checksum != remote_checksum:
+                    conflicts.append({
+                        'file': filename,
+                        'status': 'MODIFIED',
+                        'local_checksum': local_checksum,
+                        'remote_checksum': remote_checksum
+                    })
+                else:
+                    self.logger.debug(f"Archivo {filename} sin cambios")
 
             if conflicts:
                 self.logger.warning(f"⚠️  Conflictos de idempotencia detectados: {len(conflicts)}")
@@ -247,89 +663,246 @@ log_file=/tmp/nagios.log
             self.logger.error(f"Error verificando idempotencia: {e}")
             return False
 
-    def _stage_files_for_import(self, config_files: Dict[str, str]) -> bool:
+    def _stage_files_for_import(self, config_data: Dict[str, bytes]) -> bool:
         """
         Copia archivos al directorio de importación de NagiosQL
 
+        Args:
+            config_data: Diccionario con nombre_archivo: contenido codificado en UTF-8
+
         Returns:
             bool: True si todos los archivos fueron copiados exitosamente
         """
         self.logger.info("Staging de archivos para importación...")
 
-        try:
-            import paramiko
-
-            # Conectar por SSH
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-            ssh.connect(
-                hostname=self.nagiosql_host,
-                username=self.nagiosql_user,
-                key_filename=os.path.expanduser(self.nagiosql_key_path),
-                timeout=10
-            )
+        # Omitir archivos sin cambios desde la última sesión cuya copia en el servidor se ha
+        # verificado idéntica; sin verificación remota (o si falta en el servidor) se preparan
+        checksums = {filename: self._hash(data) for filename, data in config_data.items()}
+        remote_checksums = self._remote_checksums or {}
+        unchanged = [
+            filename for filename, checksum in checksums.items()
+            if self._hash_cache.get(self._hash_cache_key(filename)) == checksum
+            and remote_checksums.get(filename) == checksum
+        ]
+        for filename in unchanged:
+            self.logger.info(f"Archivo sin cambios desde la última sesión, omitido: {filename}")
+        config_data = {filename: data for filename, data in config_data.items() if filename not in unchanged}
+
+        self.staged_files = {}
+        self.skipped_files = unchanged
+        if not config_data:
+            self.logger.info(f"📁 Staging completado: sin archivos modificados ({len(unchanged)} sin cambios)")
+            return True
 
-            # Crear directorio de sesión si no existe
+        try:
+            # Conexión SSH compartida con el servidor NagiosQL
+            ssh = self._conn()
+            if self._ensure_remote_checksum_command(ssh):
+                # El servidor no dispone del comando configurado: recalcular con md5
+                checksums = {filename: self._hash(data) for filename, data in config_data.items()}
+
+            # Crear directorios de sesión y de contenido direccionable (CAS): cada contenido
+            # distinto se guarda una sola vez en .cas/<checksum> y se enlaza a sus destinos
             session_dir = os.path.join(self.import_directory, self.import_session_id)
-            ssh.exec_command(f"mkdir -p {session_dir}")
+            cas_dir = os.path.join(self.import_directory, _CAS_DIRNAME)
+            self._run_remote(ssh, f"mkdir -p {shlex.quote(session_dir)} {shlex.quote(cas_dir)}")
 
-            # Crear backups si está habilitado
+            # Crear backups si está habilitado (todos los archivos en una sola llamada)
             if self.create_backups:
                 backup_dir = os.path.join(self.backup_directory, self.import_session_id)
-                ssh.exec_command(f"mkdir -p {backup_dir}")
-
-                # Backup de archivos existentes
-                for filename in config_files.keys():
-                    src = os.path.join(self.import_directory, filename)
-                    dst = os.path.join(backup_dir, filename)
-                    ssh.exec_command(f"cp {src} {dst} 2>/dev/null || true")
-
-            # Copiar archivos
-            sftp = ssh.open_sftp()
-            self.staged_files = []
-
-            for filename, content in config_files.items():
-                # Copiar a directorio de sesión
-                session_path = os.path.join(session_dir, filename)
-                with sftp.file(session_path, 'w') as f:
-                    f.write(content)
-
-                # Copiar a directorio principal (para importación)
-                import_path = os.path.join(self.import_directory, filename)
-                with sftp.file(import_path, 'w') as f:
-                    f.write(content)
-
-                # Cambiar permisos
-                ssh.exec_command(f"chmod 644 {session_path} {import_path}")
-                ssh.exec_command(f"chown nagios:nagios {session_path} {import_path} 2>/dev/null || true")
-
-                self.staged_files.append({
-                    'filename': filename,
-                    'session_path': session_path,
-                    'import_path': import_path,
-                    'checksum': hashlib.md5(content.encode()).hexdigest()
-                })
+                backup_commands = [f"mkdir -p {shlex.quote(backup_dir)}"]
+                for filename in config_data.keys():
+                    src = shlex.quote(os.path.join(self.import_directory, filename))
+                    dst = shlex.quote(os.path.join(backup_dir, filename))
+                    backup_commands.append(f"{{ cp {src} {dst} 2>/dev/null || true; }}")
+                self._run_remote(ssh, "; ".join(backup_commands))
+
+            contents = {}
+            for filename, data in config_data.items():
+                checksum = checksums[filename]
+                contents[checksum] = data
+                self.staged_files[filename] = StagedFile(
+                    filename=filename,
+                    session_path=os.path.join(session_dir, filename),
+                    import_path=os.path.join(self.import_directory, filename),
+                    checksum=checksum
+                )
+
+            # Verificar en una única llamada qué entradas del CAS existen con el contenido que
+            # indica su nombre: una entrada editada en el servidor no se reutiliza
+            cas_paths = {checksum: os.path.join(cas_dir, checksum) for checksum in contents}
+            existing = {
+                path for path, checksum in self._remote_file_checksums(ssh, list(cas_paths.values())).items()
+                if cas_paths.get(checksum) == path
+            }
+
+            # Subir en paralelo los contenidos ausentes o alterados, a un nombre temporal que se
+            # renombra al completar para no dejar entradas CAS parciales
+            uploads = [
+                (f"{cas_path}.part", contents[checksum])
+                for checksum, cas_path in cas_paths.items()
+                if cas_path not in existing
+            ]
+            self.logger.debug(f"Contenidos reutilizados del CAS: {len(cas_paths) - len(uploads)}, a subir: {len(uploads)}")
+            self._upload_files(ssh, uploads)
+
+            # Enlazar cada contenido a su ruta de sesión (copia de solo lectura que registra lo
+            # preparado; se copia si están en sistemas de archivos distintos) y copiarlo al
+            # directorio principal (para importación). La ruta de importación tiene su propio
+            # inodo, que se reemplaza con mv para no escribir sobre enlaces de sesiones
+            # anteriores: editarla en el servidor no altera el CAS ni las copias de sesión
+            link_commands = [f"mv -f {shlex.quote(part_path)} {shlex.quote(part_path[:-len('.part')])}" for part_path, _ in uploads]
+            readonly_paths = list(cas_paths.values())
+            import_paths = []
+            for staged in self.staged_files.values():
+                src = shlex.quote(cas_paths[staged.checksum])
+                session_path = shlex.quote(staged.session_path)
+                import_path = shlex.quote(staged.import_path)
+                import_part = shlex.quote(f"{staged.import_path}.part")
+                link_commands.append(f"{{ ln -f {src} {session_path} 2>/dev/null || cp -f {src} {session_path}; }}")
+                link_commands.append(f"cp -f {src} {import_part}")
+                link_commands.append(f"mv -f {import_part} {import_path}")
+                readonly_paths.append(staged.session_path)
+                import_paths.append(staged.import_path)
+            if self._run_remote(ssh, "set -e; " + "; ".join(link_commands)) != 0:
+                raise RuntimeError("No se pudieron enlazar los archivos en el directorio de importación")
+
+            # Cambiar permisos de todos los archivos en una sola llamada y purgar entradas CAS
+            # sin enlaces que superen el periodo de retención
+            quoted_readonly = " ".join(shlex.quote(path) for path in readonly_paths)
+            quoted_import = " ".join(shlex.quote(path) for path in import_paths)
+            self._run_remote(
+                ssh,
+                f"chmod 444 {quoted_readonly}; chmod 644 {quoted_import}; "
+                f"chown nagios:nagios {quoted_readonly} {quoted_import} 2>/dev/null; "
+                f"find {shlex.quote(cas_dir)} -type f -links 1 -mtime +{self.cas_retention_days} -delete 2>/dev/null || true"
+            )
 
+            for filename in self.staged_files:
                 self.logger.info(f"✅ Archivo staged: {filename}")
 
-            sftp.close()
-            ssh.close()
+            # Registrar los checksums subidos para omitirlos en sesiones posteriores
+            for staged in self.staged_files.values():
+                self._hash_cache[self._hash_cache_key(staged.filename)] = staged.checksum
+            self._save_hash_cache()
 
-            self.logger.info(f"📁 Staging completado: {len(self.staged_files)} archivos preparados")
+            self.logger.info(f"📁 Staging completado: {len(self.staged_files)} archivos preparados, {len(unchanged)} sin cambios")
             return True
 
         except Exception as e:
             self.logger.error(f"Error en staging de archivos: {e}")
             return False
 
+    def _hash_cache_key(self, filename: str) -> str:
+        """Clave del sidecar de checksums: servidor y ruta de importación del archivo"""
+        return f"{self.nagiosql_host}:{os.path.join(self.import_directory, filename)}"
+
+    def _load_hash_cache(self) -> Dict[str, str]:
+        """Carga los checksums persistidos por sesiones de staging anteriores"""
+        try:
+            with open(self._hash_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"No se pudo cargar la caché de checksums {self._hash_cache_path}: {e}")
+            return {}
+
+    def _save_hash_cache(self) -> None:
+        """Persiste los checksums de staging de forma atómica (archivo temporal + os.replace)"""
+        tmp_path = f"{self._hash_cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._hash_cache, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self._hash_cache_path)
+        except Exception as e:
+            self.logger.warning(f"No se pudo guardar la caché de checksums {self._hash_cache_path}: {e}")
+
+    def _ensure_remote_checksum_command(self, ssh) -> bool:
+        """
+        Comprueba una sola vez que el servidor dispone del comando de checksum configurado;
+        si falta (p. ej. b2sum en coreutils < 8.26) pasa a md5sum para los checksums de
+        archivos. Retorna True si se cambió de algoritmo
+        """
+        if self._checksum_command_checked:
+            return False
+        self._checksum_command_checked = True
+
+        binary = self._remote_checksum_command.split(None, 1)[0]
+        if self._run_remote(ssh, f"command -v {binary} >/dev/null 2>&1") == 0:
+            return False
+
+        self.logger.error(f"{binary} no disponible en el servidor NagiosQL - usando md5sum para los checksums de archivos")
+        self._hash, self._remote_checksum_command = _CHECKSUM_ALGORITHMS['md5']
+        return True
+
+    def _remote_file_checksums(self, ssh, paths: List[str]) -> Dict[str, str]:
+        """
+        Calcula en una única llamada los checksums remotos de `paths` y retorna
+        {ruta: checksum}; las rutas inexistentes no aparecen. Si el comando falla
+        lanza RuntimeError en vez de tratar la salida vacía como "sin archivos"
+        """
+        if not paths:
+            return {}
+
+        quoted_paths = " ".join(shlex.quote(path) for path in paths)
+        stdin, stdout, stderr = ssh.exec_command(f"{self._remote_checksum_command} -- {quoted_paths} 2>/dev/null")
+        output = stdout.read().decode()
+        status = stdout.channel.recv_exit_status()
+        # Código 1: algún archivo no existe (habitual); cualquier otro es un fallo del comando
+        if status > 1:
+            raise RuntimeError(f"{self._remote_checksum_command} falló en el servidor (código {status})")
+
+        wanted = set(paths)
+        checksums = {}
+        for line in output.splitlines():
+            parts = line.split(None, 1)
+            if len(parts) == 2 and parts[1] in wanted:
+                checksums[parts[1]] = parts[0]
+        return checksums
+
+    def _run_remote(self, ssh, command: str) -> int:
+        """Ejecuta un comando remoto y espera a que termine, retornando su código de salida"""
+        stdin, stdout, stderr = ssh.exec_command(command)
+        return stdout.channel.recv_exit_status()
+
+    def _upload_files(self, ssh, uploads: List[Tuple[str, bytes]]) -> None:
+        """
+        Sube archivos por SFTP con varias peticiones en vuelo: cada worker abre su
+        propio canal SFTP sobre la misma conexión SSH y sube su parte de los archivos
+        """
+        workers = min(_SFTP_WORKERS, len(uploads))
+        if not workers:
+            return
+
+        transport = ssh.get_transport()
+        channels = [
+            paramiko.SFTPClient.from_transport(transport, window_size=_SFTP_WINDOW_SIZE, max_packet_size=_SFTP_MAX_PACKET_SIZE)
+            for _ in range(workers)
+        ]
+        try:
+            def upload_chunk(sftp, chunk):
+                for path, data in chunk:
+                    sftp.putfo(io.BytesIO(data), path, file_size=len(data))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(upload_chunk, channels[i], uploads[i::workers]) for i in range(workers)]
+                for future in futures:
+                    future.result()
+        finally:
+            for sftp in channels:
+                sftp.close()
+
     def _generate_import_instructions(self) -> None:
         """
         Genera instrucciones detalladas para importación manual
+
+        Las listas de archivos se escriben directamente en el archivo, sin construir
+        en memoria el texto completo de las instrucciones
         """
         instructions_file = f"/tmp/nagiosql_import_instructions_{self.import_session_id}.txt"
 
-        instructions = f"""
+        header = f"""
 ================================================================================
 INSTRUCCIONES DE IMPORTACIÓN NAGIOSQL v3.5.0
 Sesión: {self.import_session_id}
@@ -337,8 +910,9 @@ Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ================================================================================
 
 ARCHIVOS PREPARADOS:
-{chr(10).join([f"  - {f['filename']} ({f['import_path']})" for f in self.staged_files])}
+"""
 
+        middle = f"""
 PASOS PARA COMPLETAR LA IMPORTACIÓN:
 
 1. ACCEDER A NAGIOSQL:
@@ -353,8 +927,9 @@ PASOS PARA COMPLETAR LA IMPORTACIÓN:
    - Seleccionar "Import from file system"
    - Directorio de importación: {self.import_directory}
    - Archivos a importar:
-{chr(10).join([f"     ✓ {f['filename']}" for f in self.staged_files])}
+"""
 
+        footer = f"""
 4. VERIFICAR IMPORTACIÓN:
    - Revisar que no hay errores en el log de importación
    - Verificar que los objetos aparecen en las listas correspondientes
@@ -377,11 +952,21 @@ IMPORTANTE:
 
         try:
             with open(instructions_file, 'w', encoding='utf-8') as f:
-                f.write(instructions)
+                f.write(header)
+                f.writelines(f"  - {staged.filename} ({staged.import_path})\n" for staged in self.staged_files.values())
+                f.write(middle)
+                f.writelines(f"     ✓ {filename}\n" for filename in self.staged_files)
+                if self.skipped_files:
+                    f.write("\n   Sin cambios respecto al servidor (ya importados, no se prepararon de nuevo):\n")
+                    f.writelines(f"     = {filename}\n" for filename in self.skipped_files)
+                f.write(footer)
 
             self.logger.info(f"📋 Instrucciones generadas: {instructions_file}")
-            self.logger.info("=== INSTRUCCIONES PARA IMPORTACIÓN MANUAL ===")
-            self.logger.info(instructions)
+            self.logger.info(
+                f"=== IMPORTACIÓN MANUAL PENDIENTE: {len(self.staged_files)} archivos en "
+                f"{self.import_directory} (Tools → Import/Export → Import Utility), "
+                f"{len(self.skipped_files)} sin cambios omitidos ==="
+            )
 
         except Exception as e:
             self.logger.error(f"Error generando instrucciones: {e}")
@@ -398,6 +983,7 @@ IMPORTANTE:
 NagiosQL Import Session: {self.import_session_id}
 
 Files staged for import: {len(self.staged_files)}
+Files unchanged (skipped): {len(self.skipped_files)}
 Server: {self.nagiosql_host}
 Import directory: {self.import_directory}
 
@@ -411,10 +997,39 @@ Validation command after import:
 python deployment.py --validate-nagiosql-import {self.import_session_id}
 """
 
-        # Implementación básica de notificaciones (puede expandirse)
-        for recipient in self.notification_recipients:
-            self.logger.info(f"📧 Notification sent to: {recipient}")
-            # Aquí iría la lógica real de envío de emails/Slack/etc.
+        # Un único envío por canal: un email con todos los destinatarios en Bcc y un
+        # único webhook de Slack con todos los canales
+        emails = [r for r in self.notification_recipients if '@' in r]
+        channels = [r for r in self.notification_recipients if '@' not in r]
+
+        if emails:
+            try:
+                if self.smtp_config.get('smtp_server'):
+                    msg = EmailMessage()
+                    msg['Subject'] = subject
+                    msg['From'] = self.smtp_config.get('from_address', 'monitoring@localhost')
+                    msg['Bcc'] = ', '.join(emails)
+                    msg.set_content(message)
+
+                    with smtplib.SMTP(self.smtp_config['smtp_server'], self.smtp_config.get('smtp_port', 25), timeout=10) as smtp:
+                        if self.smtp_config.get('use_tls', False):
+                            smtp.starttls()
+                        smtp.send_message(msg)
+                self.logger.info(f"📧 Notification sent to: {', '.join(emails)}")
+            except Exception as e:
+                self.logger.error(f"Error enviando notificación por email: {e}")
+
+        if channels:
+            try:
+                if self.slack_webhook_url:
+                    requests.post(
+                        self.slack_webhook_url,
+                        json={'text': f"{subject}\n{message}", 'channels': channels},
+                        timeout=10
+                    ).raise_for_status()
+                self.logger.info(f"📧 Notification sent to: {', '.join(channels)}")
+            except Exception as e:
+                self.logger.error(f"Error enviando notificación por Slack: {e}")
 
     def validate_post_import(self) -> bool:
         """
@@ -441,198 +1056,378 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
             self.logger.error(f"Error en validación post-importación: {e}")
             return False
 
-    def _process_hosts_config(self, content: str) -> List[Dict]:
+    def _process_hosts_config(self, parsed: Dict[str, List[Dict]]) -> List[Dict]:
         """Procesa configuración de hosts y retorna lista de objetos"""
-        objects = []
-        host_blocks = self._parse_nagios_config_blocks(content, 'define host')
-
-        for block in host_blocks:
-            host_obj = {
-                'host_name': block.get('host_name', ''),
-                'alias': block.get('alias', ''),
-                'address': block.get('address', ''),
-                'check_command': block.get('check_command', 'check-host-alive'),
-                'check_interval': int(block.get('check_interval', 300)),
-                'retry_interval': int(block.get('retry_interval', 60)),
-                'max_check_attempts': int(block.get('max_check_attempts', 3)),
-                'check_period': block.get('check_period', '24x7'),
-                'notification_period': block.get('notification_period', '24x7'),
-                'notification_interval': int(block.get('notification_interval', 60)),
-                'notifications_enabled': block.get('notifications_enabled', '1') == '1',
-                'register': block.get('register', '1') == '1'
-            }
-
-            if self.use_checksums:
-                host_obj['_checksum'] = self._calculate_checksum(host_obj)
-
-            objects.append(host_obj)
-
-        return objects
+        return self._build_objects(parsed.get('host', []), _HOST_DEFAULTS)
 
-    def _process_services_config(self, content: str) -> List[Dict]:
+    def _process_services_config(self, parsed: Dict[str, List[Dict]]) -> List[Dict]:
         """Procesa configuración de servicios"""
-        objects = []
-        service_blocks = self._parse_nagios_config_blocks(content, 'define service')
-
-        for block in service_blocks:
-            service_obj = {
-                'service_description': block.get('service_description', ''),
-                'host_name': block.get('host_name', ''),
-                'check_command': block.get('check_command', ''),
-                'check_interval': int(block.get('check_interval', 300)),
-                'retry_interval': int(block.get('retry_interval', 60)),
-                'max_check_attempts': int(block.get('max_check_attempts', 3)),
-                'check_period': block.get('check_period', '24x7'),
-                'notification_period': block.get('notification_period', '24x7'),
-                'notification_interval': int(block.get('notification_interval', 60)),
-                'notifications_enabled': block.get('notifications_enabled', '1') == '1',
-                'contact_groups': block.get('contact_groups', ''),
-                'register': block.get('register', '1') == '1'
-            }
+        return self._build_objects(parsed.get('service', []), _SERVICE_DEFAULTS)
 
-            if self.use_checksums:
-                service_obj['_checksum'] = self._calculate_checksum(service_obj)
-
-            objects.append(service_obj)
+    def _process_commands_config(self, parsed: Dict[str, List[Dict]]) -> List[Dict]:
+        """Procesa configuración de comandos"""
+        return self._build_objects(parsed.get('command', []), _COMMAND_DEFAULTS)
 
+    def _process_contacts_config(self, parsed: Dict[str, List[Dict]]) -> List[Dict]:
+        """Procesa configuración de contactos y contactgroups"""
+        objects = self._build_objects(parsed.get('contact', []), _CONTACT_DEFAULTS)
+        objects.extend(self._build_objects(parsed.get('contactgroup', []), _CONTACTGROUP_DEFAULTS))
         return objects
 
-    def _process_commands_config(self, content: str) -> List[Dict]:
-        """Procesa configuración de comandos"""
+    def _build_objects(self, blocks: List[Dict], defaults: Dict[str, str]) -> List[Dict]:
+        """
+        Construye objetos a partir de bloques parseados: copia la plantilla de valores
+        por defecto, sobrescribe los campos presentes en el bloque y convierte los
+        campos numéricos y booleanos
+        """
+        int_fields = [k for k in _INT_FIELDS if k in defaults]
+        interval_fields = [k for k in _INTERVAL_FIELDS if k in defaults]
+        bool_fields = [k for k in _BOOL_FIELDS if k in defaults]
+        keys = defaults.keys()
         objects = []
-        command_blocks = self._parse_nagios_config_blocks(content, 'define command')
 
-        for block in command_blocks:
-            command_obj = {
-                'command_name': block.get('command_name', ''),
-                'command_line': block.get('command_line', ''),
-                'register': block.get('register', '1') == '1'
-            }
+        for block in blocks:
+            obj = defaults.copy()
+            obj.update({k: block[k] for k in keys & block.keys()})
+            for k in int_fields:
+                obj[k] = int(obj[k])
+            for k in interval_fields:
+                obj[k] = _to_number(obj[k])
+            for k in bool_fields:
+                obj[k] = obj[k] == '1'
 
             if self.use_checksums:
-                command_obj['_checksum'] = self._calculate_checksum(command_obj)
+                # Los campos siguen el orden fijo de la plantilla: los objetos iguales comparten
+                # entrada en la caché de checksums sin copiar ni ordenar
+                obj['_checksum'] = self._calculate_checksum(tuple(obj.items()))
 
-            objects.append(command_obj)
+            objects.append(obj)
 
         return objects
 
-    def _process_contacts_config(self, content: str) -> List[Dict]:
-        """Procesa configuración de contactos"""
+    def _process_config_file(self, filename: str, data: bytes) -> List[Dict]:
+        """Procesa todos los tipos de objeto de un archivo a partir de un único parseo"""
+        parsed = self._parsed(filename, data)
         objects = []
-        contact_blocks = self._parse_nagios_config_blocks(content, 'define contact')
-
-        for block in contact_blocks:
-            contact_obj = {
-                'contact_name': block.get('contact_name', ''),
-                'alias': block.get('alias', ''),
-                'email': block.get('email', ''),
-                'service_notification_period': block.get('service_notification_period', '24x7'),
-                'host_notification_period': block.get('host_notification_period', '24x7'),
-                'service_notification_options': block.get('service_notification_options', 'w,u,c,r,f,s'),
-                'host_notification_options': block.get('host_notification_options', 'd,u,r,f,s'),
-                'service_notification_commands': block.get('service_notification_commands', 'notify-service-by-email'),
-                'host_notification_commands': block.get('host_notification_commands', 'notify-host-by-email'),
-                'register': block.get('register', '1') == '1'
-            }
+        for process in (self._process_hosts_config, self._process_services_config,
+                        self._process_commands_config, self._process_contacts_config):
+            objects.extend(process(parsed))
+        return objects
 
-            if self.use_checksums:
-                contact_obj['_checksum'] = self._calculate_checksum(contact_obj)
-
-            objects.append(contact_obj)
-
-        # Procesar contactgroups también
-        contactgroup_blocks = self._parse_nagios_config_blocks(content, 'define contactgroup')
-        for block in contactgroup_blocks:
-            cg_obj = {
-                'contactgroup_name': block.get('contactgroup_name', ''),
-                'alias': block.get('alias', ''),
-                'members': block.get('members', ''),
-                'register': block.get('register', '1') == '1'
-            }
+    def _collect_blocks(self, config_data: Dict[str, bytes]) -> Dict[str, List[Dict]]:
+        """Parsea cada archivo una sola vez y agrupa los bloques de todos ellos por tipo"""
+        blocks: Dict[str, List[Dict]] = {}
+        for filename, data in config_data.items():
+            for block_type, type_blocks in self._parsed(filename, data).items():
+                blocks.setdefault(block_type, []).extend(type_blocks)
+        return blocks
 
-            if self.use_checksums:
-                cg_obj['_checksum'] = self._calculate_checksum(cg_obj)
+    def _parsed(self, filename: str, data: bytes) -> Dict[str, List[Dict]]:
+        """Retorna los bloques parseados de un archivo, reutilizándolos si su contenido no cambió"""
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        cached = self._parse_cache.get(filename)
+        if cached and cached[0] == digest:
+            return cached[1]
 
-            objects.append(cg_obj)
+        parsed = self._parse_all_blocks(data.decode('utf-8'))
+        self._parse_cache[filename] = (digest, parsed)
+        return parsed
 
-        return objects
+    def _parse_all_blocks(self, content: str) -> Dict[str, List[Dict]]:
+        """
+        Parsea en una sola pasada todos los bloques de configuración de Nagios, agrupados por tipo
 
-    def _parse_nagios_config_blocks(self, content: str, block_type: str) -> List[Dict]:
-        """Parsea bloques de configuración de Nagios"""
-        blocks = []
-        lines = content.split('\n')
-        current_block = {}
-        in_block = False
+        Un bloque solo termina en una línea que contiene únicamente '}', de modo que las
+        llaves dentro de los valores ($ARG1$ con JSON, ${VAR}) no lo cortan
+        """
+        blocks: Dict[str, List[Dict]] = {}
+        block_type = None
+        block: Dict[str, str] = {}
 
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
-            if not line or line.startswith('#'):
+            if not line or line[0] == '#':
                 continue
 
-            if line.startswith(block_type + ' {'):
-                in_block = True
-                current_block = {}
+            if block_type is None:
+                match = _DEFINE_RE.match(line)
+                if match:
+                    block_type, block = match.group(1), {}
                 continue
 
-            if line == '}' and in_block:
-                in_block = False
-                if current_block:
-                    blocks.append(current_block)
-                current_block = {}
+            if line == '}':
+                if block:
+                    blocks.setdefault(block_type, []).append(block)
+                block_type = None
                 continue
 
-            if in_block and '\t' in line:
-                key, value = line.split('\t', 1)
-                current_block[key.strip()] = value.strip()
+            parts = line.split(None, 1)
+            if len(parts) == 2:
+                block[parts[0]] = parts[1]
 
         return blocks
 
     def _import_objects_via_api(self, object_type: str, objects: List[Dict]) -> bool:
-        """Importa objetos vía API REST"""
+        """
+        Importa objetos vía API REST con varias peticiones concurrentes
+
+        Los objetos cuyo checksum ya existe en NagiosQL son idénticos a los del
+        servidor y se omiten sin petición HTTP; con update_existing, los que ya existen
+        con el mismo nombre pero distinto contenido se actualizan con PUT
+        """
+        if not objects:
+            return True
+
+        # Con el índice ya cargado, descartar los objetos sin cambios antes del envío masivo
+        index = self._checksum_index.get(object_type)
+        if index is not None:
+            objects = self._skip_unchanged(object_type, objects, index)
+            if not objects:
+                return True
+
+        # Importación masiva en una sola petición si la API la soporta
+        if object_type not in self._no_bulk:
+            result = self._bulk_import_objects(object_type, objects)
+            if result is not None:
+                return result
+
         endpoint = f"{self.base_url}/api/v1/{object_type}"
 
-        success = True
-        for obj in objects:
+        # Resolver de una vez los objetos ya existentes (checksum -> id)
+        if index is None:
+            objects = self._skip_unchanged(object_type, objects, self._find_existing_objects(object_type, objects))
+            if not objects:
+                return True
+
+        def import_one(obj: Dict) -> bool:
             try:
-                # Verificar si el objeto ya existe
-                existing_id = self._find_existing_object(object_type, obj)
+                existing_id = self._find_object_by_identity(object_type, obj) if self.update_existing else None
 
-                if existing_id and self.update_existing:
-                    # Actualizar objeto existente
+                if existing_id:
+                    # Actualizar objeto existente cuyo contenido ha cambiado
                     response = self.session.put(
                         f"{endpoint}/{existing_id}",
-                        json=obj,
+                        data=_json_dumps(obj),
                         timeout=self.timeout,
                         verify=self.verify_ssl
                     )
-                    action = "actualizado"
+                    action, doing = "actualizado", "actualizando"
                 else:
                     # Crear nuevo objeto
                     response = self.session.post(
                         endpoint,
-                        json=obj,
+                        data=_json_dumps(obj),
                         timeout=self.timeout,
                         verify=self.verify_ssl
                     )
-                    action = "creado"
+                    action, doing = "creado", "creando"
 
                 if response.status_code in [200, 201]:
+                    self._invalidate_get_cache(object_type)
                     self.logger.info(f"Objeto {object_type} {action}: {obj.get('host_name', obj.get('service_description', obj.get('command_name', 'unknown')))}")
-                else:
-                    self.logger.error(f"Error {action} objeto {object_type}: {response.status_code} - {response.text}")
-                    success = False
+                    self._index_object(object_type, obj, existing_id, response)
+                    return True
+
+                self.logger.error(f"Error {doing} objeto {object_type}: {response.status_code} - {response.text}")
+                return False
 
             except Exception as e:
                 self.logger.error(f"Error procesando objeto {object_type}: {e}")
-                success = False
+                return False
 
-        return success
+        with ThreadPoolExecutor(max_workers=min(_API_WORKERS, len(objects))) as executor:
+            results = list(executor.map(import_one, objects))
+
+        return all(results)
+
+    def _skip_unchanged(self, object_type: str, objects: List[Dict], existing_ids: Dict[str, str]) -> List[Dict]:
+        """Retorna los objetos cuyo checksum (actual o legado) no existe aún en NagiosQL"""
+        pending = [
+            obj for obj in objects
+            if not any(checksum in existing_ids for checksum in self._object_checksums(obj))
+        ]
+        skipped = len(objects) - len(pending)
+        if skipped:
+            self.logger.info(f"Objetos {object_type} sin cambios omitidos: {skipped}")
+        return pending
+
+    def _bulk_import_objects(self, object_type: str, objects: List[Dict]) -> Optional[bool]:
+        """
+        Importa todos los objetos en una única petición al endpoint masivo; el servidor
+        deduplica por checksum. Retorna None si la API no dispone de ese endpoint
+        """
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/v1/{object_type}/bulk",
+                data=_json_dumps({'items': objects, 'update_existing': self.update_existing}),
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+
+            if response.status_code in (404, 405):
+                self.logger.debug(f"Endpoint masivo no disponible para {object_type} - importando objeto a objeto")
+                self._no_bulk.add(object_type)
+                return None
+
+            if response.status_code in [200, 201]:
+                self._invalidate_get_cache(object_type)
+                self.logger.info(f"Objetos {object_type} importados en bloque: {len(objects)}")
+                return True
+
+            self.logger.error(f"Error en importación masiva de {object_type}: {response.status_code} - {response.text}")
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Error en importación masiva de {object_type}: {e}")
+            return False
+
+    def _find_existing_objects(self, object_type: str, objects: List[Dict]) -> Dict[str, str]:
+        """
+        Busca en una sola petición los objetos existentes por checksum y retorna
+        {checksum: id}; si la API no ofrece búsqueda por lotes, consulta cada
+        checksum concurrentemente
+        """
+        if not self.use_checksums:
+            return {}
+
+        checksums = list({checksum for obj in objects for checksum in self._object_checksums(obj)})
+        if not checksums:
+            return {}
+
+        # Índice checksum -> id precargado con un único listado del tipo de objeto
+        index = self._checksum_index.get(object_type)
+        if index is None:
+            index = self._prefetch_checksum_index(object_type)
+        if index is not None:
+            return index
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/v1/{object_type}/search/batch",
+                data=_json_dumps({'checksums': checksums}),
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+
+            if response.status_code == 200:
+                return {str(checksum): str(object_id) for checksum, object_id in _json_loads(response.content).items()}
+            if response.status_code not in (404, 405):
+                self.logger.warning(f"Error en búsqueda por lotes de {object_type}: {response.status_code}")
+
+        except Exception as e:
+            self.logger.warning(f"Error en búsqueda por lotes de {object_type}: {e}")
+
+        with ThreadPoolExecutor(max_workers=min(_API_WORKERS, len(checksums))) as executor:
+            object_ids = list(executor.map(
+                lambda checksum: self._find_existing_object(object_type, {'_checksum': checksum}),
+                checksums
+            ))
+
+        return {checksum: object_id for checksum, object_id in zip(checksums, object_ids) if object_id}
+
+    def _prefetch_checksum_index(self, object_type: str) -> Optional[Dict[str, str]]:
+        """
+        Descarga una sola vez el id, el checksum y los campos identificadores de un tipo
+        de objeto y los guarda como índices {checksum: id} e {identidad: (id, checksum)};
+        retorna el primero o None si no se pudo obtener
+        """
+        identity_fields = _API_IDENTITY_FIELDS.get(object_type, ())
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/{object_type}",
+                params={'fields': ','.join(('id', '_checksum') + identity_fields)},
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+
+            if response.status_code == 200:
+                items = _json_loads(response.content)
+                index = {
+                    str(item['_checksum']): str(item.get('id'))
+                    for item in items
+                    if item.get('_checksum')
+                }
+                if identity_fields:
+                    identities = {}
+                    for item in items:
+                        identity = _object_identity(object_type, item)
+                        if any(identity):
+                            identities[identity] = (str(item.get('id')), item.get('_checksum'))
+                    self._identity_index[object_type] = identities
+                self._checksum_index[object_type] = index
+                return index
+
+            self.logger.debug(f"No se pudo precargar el índice de {object_type}: {response.status_code}")
+
+        except Exception as e:
+            self.logger.debug(f"No se pudo precargar el índice de {object_type}: {e}")
+
+        return None
+
+    def _index_object(self, object_type: str, obj: Dict, existing_id: Optional[str], response) -> None:
+        """
+        Actualiza los índices de checksums e identidades tras crear un objeto o
+        actualizar el objeto existing_id
+        """
+        index = self._checksum_index.get(object_type)
+        checksum = obj.get('_checksum')
+        if index is None or not checksum:
+            return
+
+        object_id = existing_id
+        if not object_id:
+            try:
+                object_id = _json_loads(response.content).get('id')
+            except Exception:
+                object_id = None
+        if not object_id:
+            return
+
+        identities = self._identity_index.get(object_type)
+        if identities is not None:
+            identity = _object_identity(object_type, obj)
+            previous = identities.get(identity)
+            if previous and previous[1]:
+                # El checksum anterior ya no describe el contenido del objeto
+                index.pop(previous[1], None)
+            identities[identity] = (str(object_id), checksum)
+        index[checksum] = str(object_id)
+
+    def _find_object_by_identity(self, object_type: str, obj: Dict) -> Optional[str]:
+        """Busca el id de un objeto existente con los mismos campos identificadores"""
+        identity = _object_identity(object_type, obj)
+        if not any(identity):
+            return None
+
+        # Servir desde el índice precargado sin petición de red
+        identities = self._identity_index.get(object_type)
+        if identities is not None:
+            entry = identities.get(identity)
+            return entry[0] if entry else None
+
+        try:
+            status_code, _, results = self._cached_get(
+                f"{self.base_url}/api/v1/{object_type}/search",
+                params=dict(zip(_API_IDENTITY_FIELDS[object_type], identity))
+            )
+            if status_code == 200 and results:
+                return str(results[0].get('id'))
+
+        except Exception as e:
+            self.logger.warning(f"Error buscando objeto existente: {e}")
+
+        return None
 
     def _find_existing_object(self, object_type: str, obj: Dict) -> Optional[str]:
         """Busca objeto existente por checksum o identificador único"""
         if not self.use_checksums:
             return None
 
+        # Servir desde el índice precargado sin petición de red
+        index = self._checksum_index.get(object_type)
+        if index is not None:
+            return index.get(obj.get('_checksum'))
+
         try:
             # Endpoint para buscar objetos
             search_endpoint = f"{self.base_url}/api/v1/{object_type}/search"
@@ -640,15 +1435,9 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
             # Usar checksum para búsqueda
             checksum = obj.get('_checksum')
             if checksum:
-                response = self.session.get(
-                    search_endpoint,
-                    params={'checksum': checksum},
-                    timeout=self.timeout,
-                    verify=self.verify_ssl
-                )
+                status_code, _, results = self._cached_get(search_endpoint, params={'checksum': checksum})
 
-                if response.status_code == 200:
-                    results = response.json()
+                if status_code == 200:
                     if results and len(results) > 0:
                         return str(results[0].get('id'))
 
@@ -657,14 +1446,46 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
 
         return None
 
-    def _calculate_checksum(self, obj: Dict) -> str:
-        """Calcula checksum para idempotencia"""
-        # Remover campos internos antes de calcular checksum
-        clean_obj = {k: v for k, v in obj.items() if not k.startswith('_')}
+    def _calculate_checksum(self, fields: Tuple[Tuple[str, Any], ...]) -> str:
+        """
+        Calcula checksum para idempotencia a partir de los pares (campo, valor) de un
+        objeto, sin campos internos
+        """
+        return _hash_frozen(fields, self.checksum_algorithm)
+
+    def _object_checksums(self, obj: Dict) -> Tuple[str, ...]:
+        """
+        Checksums con los que un objeto puede estar guardado en NagiosQL: el actual y,
+        si el algoritmo configurado no es el legado, el md5 de versiones anteriores
+        """
+        checksum = obj.get('_checksum')
+        if not checksum:
+            return ()
+        if self.checksum_algorithm == _LEGACY_CHECKSUM_ALGORITHM:
+            return (checksum,)
+        fields = tuple((k, v) for k, v in obj.items() if not k.startswith('_'))
+        return checksum, _hash_frozen(fields, _LEGACY_CHECKSUM_ALGORITHM)
+
+    def _import_via_api(self, config_files: Dict[str, str]) -> bool:
+        """
+        Importa configuraciones vía API REST
+
+        Cada archivo se parsea una sola vez y los bloques se reparten por tipo de
+        objeto hacia su endpoint
+        """
+        self.logger.info("Importando vía API REST")
+
+        blocks = self._collect_blocks({
+            filename: content.encode('utf-8') for filename, content in config_files.items()
+        })
+
+        success = True
+        for object_type, (endpoint, defaults) in _API_ENDPOINTS.items():
+            objects = self._build_objects(blocks.get(object_type, []), defaults)
+            if objects and not self._import_objects_via_api(endpoint, objects):
+                success = False
 
-        # Serializar y calcular hash
-        obj_str = json.dumps(clean_obj, sort_keys=True)
-        return hashlib.md5(obj_str.encode()).hexdigest()
+        return success
 
     def _import_via_database(self, config_files: Dict[str, str]) -> bool:
         """
@@ -676,12 +1497,15 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
         - tbl_service
         - tbl_command
         - tbl_contact
+        - tbl_contactgroup
         """
         self.logger.info("Importando vía base de datos directa")
 
-        try:
-            import mysql.connector
+        if not MYSQL_AVAILABLE:
+            self.logger.error("mysql-connector no disponible - instalar con: pip install mysql-connector-python")
+            return False
 
+        try:
             # Conectar a la base de datos
             conn = mysql.connector.connect(
                 host=self.db_config.get('host', 'localhost'),
@@ -691,30 +1515,43 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
                 port=self.db_config.get('port', 3306)
             )
 
+            conn.autocommit = False
+
+            # Parsear todos los archivos una sola vez y agrupar los bloques por tipo
+            blocks = self._collect_blocks({
+                filename: content.encode('utf-8') for filename, content in config_files.items()
+            })
+
+            # executemany (INSERT multi-fila) por tabla en lotes de _DB_BATCH_SIZE, todo en una transacción
             cursor = conn.cursor()
+            try:
+                for object_type, (table, defaults) in _DB_TABLES.items():
+                    objects = self._build_objects(blocks.get(object_type, []), defaults)
+                    if not objects:
+                        continue
+
+                    columns = list(defaults)
+                    sql = (
+                        f"INSERT INTO {table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                        f"ON DUPLICATE KEY UPDATE {', '.join(f'{c}=VALUES({c})' for c in columns)}"
+                    )
+                    rows = [tuple(obj[c] for c in columns) for obj in objects]
+                    for i in range(0, len(rows), _DB_BATCH_SIZE):
+                        cursor.executemany(sql, rows[i:i + _DB_BATCH_SIZE])
+                    self.logger.info(f"Objetos {object_type} importados en {table}: {len(objects)}")
 
-            # Procesar configuraciones
-            success = True
-
-            for filename, content in config_files.items():
-                try:
-                    if filename == 'hosts.cfg':
-                        self._import_hosts_to_db(cursor, content)
-                    elif filename == 'services.cfg':
-                        self._import_services_to_db(cursor, content)
-                    elif filename == 'commands.cfg':
-                        self._import_commands_to_db(cursor, content)
-                    elif filename == 'contacts.cfg':
-                        self._import_contacts_to_db(cursor, content)
-                except Exception as e:
-                    self.logger.error(f"Error importando {filename}: {e}")
-                    success = False
-
-            conn.commit()
-            cursor.close()
-            conn.close()
-
-            return success
+                conn.commit()
+                return True
+
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"Error importando en base de datos (transacción revertida): {e}")
+                return False
+
+            finally:
+                cursor.close()
+                conn.close()
 
         except Exception as e:
             self.logger.error(f"Error de conexión a base de datos: {e}")
@@ -722,17 +1559,54 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
 
     def _import_via_file(self, config_files: Dict[str, str]) -> bool:
         """
-        Importa vía archivos temporales que NagiosQL puede procesar
+        Importa vía archivos .cfg que NagiosQL puede procesar
+
+        Si hay API configurada, los archivos se suben desde memoria en una única
+        petición multipart a /api/v1/import/files. Con write_to_disk (o sin API)
+        se escriben en un directorio temporal para importarlos vía la interfaz
+        de administración
+        """
+        if self.write_to_disk or not self.base_url:
+            return self._import_via_temp_files(config_files)
+
+        self.logger.info("Importando vía subida de archivos en memoria")
+
+        files = {
+            filename: (filename, io.BytesIO(content.encode('utf-8')), 'text/plain')
+            for filename, content in config_files.items()
+        }
+
+        try:
+            # Content-Type: None para que requests genere la cabecera multipart con su boundary
+            response = self.session.post(
+                f"{self.base_url}/api/v1/import/files",
+                files=files,
+                headers={'Content-Type': None},
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+
+            if response.status_code in [200, 201]:
+                with self._get_cache_lock:
+                    self._get_cache.clear()
+                self.logger.info(f"Archivos subidos a NagiosQL: {len(files)}")
+                return True
+
+            self.logger.error(f"Error subiendo archivos: {response.status_code} - {response.text}")
+            return False
 
-        Este método crea archivos .cfg temporales que NagiosQL puede importar
+        except Exception as e:
+            self.logger.error(f"Error subiendo archivos: {e}")
+            return False
+
+    def _import_via_temp_files(self, config_files: Dict[str, str]) -> bool:
+        """
+        Escribe los archivos .cfg en un directorio temporal que NagiosQL puede importar
         vía su interfaz de administración
         """
         self.logger.info("Importando vía archivos temporales")
 
         try:
-            import tempfile
-            import os
-
             # Crear directorio temporal
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Escribir archivos de configuración
@@ -741,9 +1615,6 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
                     with open(filepath, 'w', encoding='utf-8') as f:
                         f.write(content)
 
-                # Aquí iría la lógica para notificar a NagiosQL sobre los archivos
-                # Por ejemplo, vía API de importación de archivos o webhook
-
                 self.logger.info(f"Archivos preparados en: {temp_dir}")
                 self.logger.warning("Importación vía archivos requiere intervención manual en NagiosQL")
 
@@ -773,17 +1644,12 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
             endpoints = ['hosts', 'services', 'commands', 'contacts']
 
             for endpoint in endpoints:
-                response = self.session.get(
-                    f"{self.base_url}/api/v1/{endpoint}",
-                    timeout=self.timeout,
-                    verify=self.verify_ssl
-                )
+                count, status_code = self._count_objects(endpoint)
 
-                if response.status_code == 200:
-                    count = len(response.json())
+                if count is not None:
                     self.logger.info(f"Objetos {endpoint}: {count} encontrados")
                 else:
-                    self.logger.warning(f"Error verificando {endpoint}: {response.status_code}")
+                    self.logger.warning(f"Error verificando {endpoint}: {status_code}")
 
             return True
 
@@ -791,6 +1657,61 @@ python deployment.py --validate-nagiosql-import {self.import_session_id}
             self.logger.error(f"Error validando importación: {e}")
             return False
 
+    def _count_objects(self, endpoint: str) -> Tuple[Optional[int], int]:
+        """
+        Cuenta los objetos de un endpoint sin descargar la colección completa.
+        Prueba HEAD con X-Total-Count, después GET con count=true y, si el servidor
+        ignora el parámetro y devuelve la lista, cuenta sus elementos.
+        Retorna (count, status_code); count es None si el endpoint falla.
+        """
+        url = f"{self.base_url}/api/v1/{endpoint}"
+
+        response = self.session.head(url, timeout=self.timeout, verify=self.verify_ssl)
+        total = response.headers.get('X-Total-Count')
+        if response.status_code == 200 and total is not None and total.isdigit():
+            return int(total), response.status_code
+
+        status_code, headers, data = self._cached_get(url, params={'count': 'true'})
+        if status_code != 200:
+            return None, status_code
+
+        total = headers.get('X-Total-Count')
+        if total is not None and total.isdigit():
+            return int(total), status_code
+
+        if isinstance(data, dict) and isinstance(data.get('count'), int):
+            return data['count'], status_code
+        return len(data), status_code
+
+    def _cached_get(self, url: str, params: Optional[Dict[str, str]] = None,
+                    ttl: float = _GET_CACHE_TTL) -> Tuple[int, Any, Any]:
+        """
+        GET a la API con caché de respuestas exitosas durante ttl segundos.
+        Retorna (status_code, cabeceras, JSON decodificado o None si no es 200)
+        """
+        key = (url, frozenset(params.items()) if params else frozenset())
+        with self._get_cache_lock:
+            cached = self._get_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < ttl:
+            return cached[1:]
+
+        response = self.session.get(url, params=params, timeout=self.timeout, verify=self.verify_ssl)
+        if response.status_code != 200:
+            return response.status_code, response.headers, None
+
+        result = (response.status_code, response.headers, _json_loads(response.content))
+        with self._get_cache_lock:
+            self._get_cache[key] = (now,) + result
+        return result
+
+    def _invalidate_get_cache(self, object_type: str) -> None:
+        """Descarta las respuestas en caché de un tipo de objeto tras modificarlo"""
+        prefix = f"{self.base_url}/api/v1/{object_type}"
+        with self._get_cache_lock:
+            for key in [key for key in self._get_cache if key[0] == prefix or key[0].startswith(prefix + '/')]:
+                del self._get_cache[key]
+
     def export_to_nagios(self) -> bool:
         """Exporta configuraciones desde NagiosQL a Nagios"""
         self.logger.info("Exportando configuraciones a Nagios")
@@ -1,2 +1,2 @@
 # Plugins package
-from .check_manager import check_manager
\ No newline at end of file
+from .check_manager import get_check_manager
\ No newline at end of file
@@ -5,12 +5,15 @@ Gestor de plugins de checks para monitorización
 """
 
 import importlib
-import inspect
 import logging
-from typing import Dict, Any, Optional, Type, Tuple
-from pathlib import Path
+import os
+from collections import ChainMap
+from typing import Callable, Dict, Any, Optional, Type, Tuple
 from .checks.base import BaseCheck
 
+# Variable de entorno que activa la carga de checks de terceros desde plugins/checks
+_DYNAMIC_CHECKS_ENV = 'MON_ENABLE_DYNAMIC_CHECKS'
+
 
 class CheckManager:
     """Gestor de plugins de checks"""
@@ -18,61 +21,90 @@ class CheckManager:
     def __init__(self):
         self.logger = logging.getLogger('CheckManager')
         self.checks = {}
+        # Rutas de checks aún no importados: protocolo -> 'modulo.Clase' (built-in) o 'modulo' (dinámico)
+        self._builtin_paths: Dict[str, str] = {}
+        self._dynamic_index: Dict[str, str] = {}
+        self._singleton_checks: Dict[str, Optional[BaseCheck]] = {}
+        self._params_cache: Dict[str, Tuple[list, list]] = {}  # protocolo -> (requeridos, opcionales)
         self.logger.debug("Inicializando CheckManager...")
         self._load_builtin_checks()
         self._load_dynamic_checks()
-        self.logger.info(f"CheckManager inicializado con {len(self.checks)} checks disponibles")
+        self.logger.info(f"CheckManager inicializado con {len(self.get_available_checks())} checks disponibles")
 
     def _load_builtin_checks(self):
-        """Carga los checks incorporados"""
-        self.logger.debug("Cargando checks incorporados...")
-        builtin_checks = {
-            'http': 'plugins.checks.http.HTTPCheck',
-            'tcp': 'plugins.checks.tcp.TCPCheck',
-            'docker': 'plugins.checks.docker.DockerCheck',
-            'kubernetes': 'plugins.checks.kubernetes.KubernetesCheck',
-            'prometheus': 'plugins.checks.prometheus.PrometheusCheck',
-            'custom': 'plugins.checks.custom.CustomCheck'
-        }
-
-        for name, module_path in builtin_checks.items():
-            try:
-                self._load_check_class(name, module_path)
-                self.logger.debug(f"Check incorporado cargado: {name}")
-            except Exception as e:
-                self.logger.error(f"Error cargando check incorporado {name}: {e}")
+        """Registra los checks incorporados; el módulo se importa en el primer uso"""
+        self.logger.debug("Registrando checks incorporados...")
+        self._builtin_paths.update({
+            'http': 'plugins.checks._impl.HTTPCheck',
+            'tcp': 'plugins.checks._impl.TCPCheck',
+            'docker': 'plugins.checks._impl.DockerCheck',
+            'kubernetes': 'plugins.checks._impl.KubernetesCheck',
+            'prometheus': 'plugins.checks._impl.PrometheusCheck',
+            'custom': 'plugins.checks._impl.CustomCheck'
+        })
 
     def _load_dynamic_checks(self):
-        """Carga checks dinámicamente desde el directorio plugins/checks"""
-        self.logger.debug("Cargando checks dinámicos...")
-        checks_dir = Path(__file__).parent / 'checks'
-        if not checks_dir.exists():
+        """
+        Indexa por nombre de fichero los checks del directorio plugins/checks, sin importarlos.
+        Desactivado salvo MON_ENABLE_DYNAMIC_CHECKS=1: todos los checks incluidos son built-in
+        """
+        if os.environ.get(_DYNAMIC_CHECKS_ENV) != '1':
+            self.logger.debug(f"Checks dinámicos desactivados (activar con {_DYNAMIC_CHECKS_ENV}=1)")
+            return
+
+        self.logger.debug("Indexando checks dinámicos...")
+        checks_dir = os.path.join(os.path.dirname(__file__), 'checks')
+        try:
+            entries = list(os.scandir(checks_dir))
+        except FileNotFoundError:
             self.logger.warning(f"Directorio de checks no encontrado: {checks_dir}")
             return
 
-        dynamic_checks_loaded = 0
-        for py_file in checks_dir.glob('*.py'):
-            if py_file.name.startswith('__'):
-                continue  # Saltar __init__.py y similares
+        for entry in entries:
+            # Saltar __init__.py, módulos privados (_impl.py) y el módulo de BaseCheck
+            if not entry.name.endswith('.py') or entry.name.startswith('_') or entry.name == 'base.py':
+                continue
+
+            stem = entry.name[:-3]
+            check_name = stem.lower().replace('check', '')
+            if check_name in self._builtin_paths:
+                continue  # Evitar sobrescribir built-ins
+            self._dynamic_index[check_name] = f"plugins.checks.{stem}"
+
+        self.logger.debug(f"Checks dinámicos indexados: {len(self._dynamic_index)}")
 
-            module_name = f"plugins.checks.{py_file.stem}"
+    def _resolve_check_class(self, protocol_lower: str) -> Optional[Type[BaseCheck]]:
+        """Importa bajo demanda el módulo del check de un protocolo aún no cargado"""
+        module_path = self._builtin_paths.pop(protocol_lower, None)
+        if module_path:
             try:
-                module = importlib.import_module(module_name)
-                # Buscar clases que hereden de BaseCheck
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if issubclass(obj, BaseCheck) and obj != BaseCheck:
-                        # Usar el nombre de la clase en minúsculas como clave
-                        check_name = name.lower().replace('check', '')
-                        if check_name not in self.checks:  # Evitar sobrescribir built-ins
-                            self.checks[check_name] = obj
-                            self.logger.info(f"Check dinámico cargado: {check_name} desde {module_name}")
-                            dynamic_checks_loaded += 1
-                        else:
-                            self.logger.debug(f"Check {check_name} ya existe, omitiendo versión dinámica")
+                self._load_check_class(protocol_lower, module_path)
+                self.logger.debug(f"Check incorporado cargado: {protocol_lower}")
             except Exception as e:
-                self.logger.error(f"Error cargando check dinámico desde {module_name}: {e}")
+                self.logger.error(f"Error cargando check incorporado {protocol_lower}: {e}")
+            return self.checks.get(protocol_lower)
 
-        self.logger.debug(f"Checks dinámicos cargados: {dynamic_checks_loaded}")
+        module_name = self._dynamic_index.pop(protocol_lower, None)
+        if module_name:
+            self._load_dynamic_module(module_name)
+        return self.checks.get(protocol_lower)
+
+    def _load_dynamic_module(self, module_name: str):
+        """Importa un módulo de checks dinámico y registra sus subclases de BaseCheck"""
+        try:
+            module = importlib.import_module(module_name)
+            # Buscar clases que hereden de BaseCheck
+            for name, obj in list(vars(module).items()):
+                if isinstance(obj, type) and issubclass(obj, BaseCheck) and obj is not BaseCheck:
+                    # Usar el nombre de la clase en minúsculas como clave
+                    check_name = name.lower().replace('check', '')
+                    if check_name not in self.checks and check_name not in self._builtin_paths:  # Evitar sobrescribir built-ins
+                        self.checks[check_name] = obj
+                        self.logger.info(f"Check dinámico cargado: {check_name} desde {module_name}")
+                    else:
+                        self.logger.debug(f"Check {check_name} ya existe, omitiendo versión dinámica")
+        except Exception as e:
+            self.logger.error(f"Error cargando check dinámico desde {module_name}: {e}")
 
     def _load_check_class(self, name: str, module_path: str):
         """Carga una clase de check desde un módulo"""
@@ -86,30 +118,46 @@ class CheckManager:
         self.checks[name] = check_class
 
     def get_check(self, protocol: str, config: Dict[str, Any]) -> Optional[BaseCheck]:
-        """Obtiene una instancia de check para el protocolo dado"""
+        """
+        Obtiene una instancia de check para el protocolo dado; con config vacía
+        retorna la instancia compartida del protocolo
+        """
+        if not config:
+            return self._get_check_singleton(protocol)
+        return self._create_check(protocol, config)
+
+    def _create_check(self, protocol: str, config: Dict[str, Any]) -> Optional[BaseCheck]:
+        """Crea una instancia nueva del check del protocolo"""
         protocol_lower = protocol.lower()
-        self.logger.debug(f"Solicitando check para protocolo: {protocol_lower}")
-        check_class = self.checks.get(protocol_lower)
+        self.logger.debug("Solicitando check para protocolo: %s", protocol_lower)
+        check_class = self.checks.get(protocol_lower) or self._resolve_check_class(protocol_lower)
         if not check_class:
             self.logger.warning(f"Protocolo no soportado: {protocol_lower}")
             return None
 
         try:
             instance = check_class(protocol, config)
-            self.logger.debug(f"Instancia de check creada: {protocol_lower}")
+            self.logger.debug("Instancia de check creada: %s", protocol_lower)
             return instance
         except Exception as e:
             self.logger.error(f"Error creando instancia de check {protocol_lower}: {e}")
             return None
 
+    def _get_check_singleton(self, protocol: str) -> Optional[BaseCheck]:
+        """Instancia compartida (config vacía) del check de un protocolo, creada una sola vez"""
+        protocol_lower = protocol.lower()
+        if protocol_lower not in self._singleton_checks:
+            self._singleton_checks[protocol_lower] = self._create_check(protocol, {})
+        return self._singleton_checks[protocol_lower]
+
     def get_available_checks(self) -> list:
-        """Retorna lista de checks disponibles"""
-        return list(self.checks.keys())
+        """Retorna lista de checks disponibles (cargados o pendientes de importar)"""
+        return list({**self.checks, **self._builtin_paths, **self._dynamic_index}.keys())
 
     def validate_dependency_config(self, dependency_config: Dict[str, Any]) -> Tuple[bool, str]:
         """Valida configuración de dependencia usando el check apropiado"""
         protocol = dependency_config.get('check_protocol', 'tcp')
-        check_instance = self.get_check(protocol, {})
+        check_instance = self._get_check_singleton(protocol)
 
         if not check_instance:
             return False, f"Protocolo '{protocol}' no soportado"
@@ -118,47 +166,96 @@ class CheckManager:
 
     def get_nagios_command(self, dependency_config: Dict[str, Any], host_address: str) -> str:
         """Genera comando de Nagios para una dependencia"""
+        return self.get_command_builder(dependency_config)(host_address)
+
+    def get_command_builder(self, dependency_config: Dict[str, Any]) -> Callable[[str], str]:
+        """
+        Resuelve una sola vez el check de una dependencia y retorna una función
+        que genera el comando de Nagios para cada dirección de host
+        """
         protocol = dependency_config.get('check_protocol', 'tcp')
         dep_name = dependency_config.get('name', 'unknown')
-        self.logger.debug(f"Generando comando Nagios para {dep_name} (protocolo: {protocol}) en {host_address}")
+        port = dependency_config.get('port', 80)
 
-        check_instance = self.get_check(protocol, {})
+        check_instance = self._get_check_singleton(protocol)
 
         if not check_instance:
             # Fallback a TCP básico
-            port = dependency_config.get('port', 80)
-            fallback_command = f"check_tcp -H {host_address} -p {port}"
-            self.logger.warning(f"Usando comando fallback TCP para {dep_name}: {fallback_command}")
-            return fallback_command
+            def build_fallback(host_address: str) -> str:
+                fallback_command = f"check_tcp -H {host_address} -p {port}"
+                self.logger.warning(f"Usando comando fallback TCP para {dep_name}: {fallback_command}")
+                return fallback_command
 
-        # Enriquecer config con dirección del host
-        enriched_config = dependency_config.copy()
-        enriched_config['host_address'] = host_address
+            return build_fallback
 
-        try:
-            command = check_instance.get_nagios_command(enriched_config)
-            self.logger.debug(f"Comando generado para {dep_name}: {command}")
-            return command
-        except Exception as e:
-            self.logger.error(f"Error generando comando para {dep_name}: {e}")
-            # Fallback
-            port = dependency_config.get('port', 80)
-            return f"check_tcp -H {host_address} -p {port}"
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        if not hasattr(check_instance, 'parse'):
+            # Plugins sin parse(): la dirección del host se antepone a la config sin copiarla
+            def generate(host_address: str) -> str:
+                return check_instance.get_nagios_command(ChainMap({'host_address': host_address}, dependency_config))
+        else:
+            # La configuración de la dependencia se lee una sola vez para todos sus hosts
+            parsed = []
+
+            def generate(host_address: str) -> str:
+                if not parsed:
+                    parsed.append(check_instance.parse(dependency_config))
+                return check_instance.build_command(parsed[0], host_address)
+
+        def build(host_address: str) -> str:
+            if debug:
+                self.logger.debug("Generando comando Nagios para %s (protocolo: %s) en %s", dep_name, protocol, host_address)
+
+            try:
+                command = generate(host_address)
+                if debug:
+                    self.logger.debug("Comando generado para %s: %s", dep_name, command)
+                return command
+            except Exception as e:
+                self.logger.error(f"Error generando comando para {dep_name}: {e}")
+                # Fallback
+                return f"check_tcp -H {host_address} -p {port}"
+
+        return build
 
     def get_required_params(self, protocol: str) -> list:
         """Obtiene parámetros requeridos para un protocolo"""
-        check_instance = self.get_check(protocol, {})
-        if not check_instance:
-            return []
-        return check_instance.get_required_params()
+        return self._get_params(protocol)[0]
 
     def get_optional_params(self, protocol: str) -> list:
         """Obtiene parámetros opcionales para un protocolo"""
-        check_instance = self.get_check(protocol, {})
-        if not check_instance:
-            return []
-        return check_instance.get_optional_params()
+        return self._get_params(protocol)[1]
+
+    def _get_params(self, protocol: str) -> Tuple[list, list]:
+        """Parámetros (requeridos, opcionales) de un protocolo, calculados una sola vez"""
+        protocol_lower = protocol.lower()
+        params = self._params_cache.get(protocol_lower)
+        if params is None:
+            check_instance = self._get_check_singleton(protocol)
+            if not check_instance:
+                params = ([], [])
+            else:
+                params = (check_instance.get_required_params(), check_instance.get_optional_params())
+            self._params_cache[protocol_lower] = params
+        return params
+
+
+# Instancia global del manager, creada en el primer uso para no pagar la carga
+# de checks al importar el módulo
+_check_manager: Optional[CheckManager] = None
+
+
+def get_check_manager() -> CheckManager:
+    """Retorna la instancia global de CheckManager, creándola si aún no existe"""
+    global _check_manager
+    if _check_manager is None:
+        _check_manager = CheckManager()
+    return _check_manager
 
 
-# Instancia global del manager
-check_manager = CheckManager()
\ No newline at end of file
+def __getattr__(name):
+    # Compatibilidad con `from plugins.check_manager import check_manager`
+    if name == 'check_manager':
+        return get_check_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
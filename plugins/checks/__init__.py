@@ -1,13 +1,9 @@
 # Plugins de checks para monitorización
 # Sistema extensible de protocolos de verificación
 
+import importlib
+
 from .base import BaseCheck
-from .http import HTTPCheck
-from .tcp import TCPCheck
-from .docker import DockerCheck
-from .kubernetes import KubernetesCheck
-from .prometheus import PrometheusCheck
-from .custom import CustomCheck
 
 __all__ = [
     'BaseCheck',
@@ -17,4 +13,27 @@ __all__ = [
     'KubernetesCheck',
     'PrometheusCheck',
     'CustomCheck'
-]
\ No newline at end of file
+]
+
+# Los plugins se importan en el primer acceso (PEP 562); todos viven en el
+# módulo _impl, de modo que basta un único import para cualquier protocolo
+_LAZY_CHECKS = {
+    'HTTPCheck': '._impl',
+    'TCPCheck': '._impl',
+    'DockerCheck': '._impl',
+    'KubernetesCheck': '._impl',
+    'PrometheusCheck': '._impl',
+    'CustomCheck': '._impl'
+}
+
+def __getattr__(name):
+    module_name = _LAZY_CHECKS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    check_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = check_class
+    return check_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Check Plugins
+Implementación de los checks incorporados (HTTP, TCP, Docker, Kubernetes,
+Prometheus y custom) en un único módulo: un solo fichero que localizar y
+compilar al importar los plugins
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
+from .base import BaseCheck
+
+
+@dataclass(slots=True, frozen=True)
+class HTTPConfig:
+    """Campos de una dependencia HTTP"""
+    port: Any  # Tal cual en la dependencia (validación)
+    command_port: Any  # Con el puerto 80 por defecto (comando)
+    has_params: bool
+    url: Any
+    expected_status: Any
+    timeout: Any
+    auth_user: Any
+    auth_pass: Any
+    ssl: Any
+
+
+class HTTPCheck(BaseCheck):
+    """Plugin para checks HTTP/HTTPS"""
+
+    # Plantilla del comando: cada parte opcional llega ya formateada o vacía
+    _TEMPLATE = "check_http -H {host_address} -p {port}{url_part}{status_part}{timeout_part}{auth_part}{ssl_part}"
+
+    def get_required_params(self) -> list:
+        return ['port']
+
+    def get_optional_params(self) -> list:
+        return ['url', 'expected_status', 'timeout', 'auth_user', 'auth_pass', 'ssl']
+
+    def parse(self, dependency_config: Dict[str, Any]) -> 'HTTPConfig':
+        """Lee una sola vez los campos de una dependencia HTTP"""
+        check_params = dependency_config.get('check_params', {})
+        if not check_params:
+            check_params = {}
+
+        return HTTPConfig(
+            port=dependency_config.get('port'),
+            command_port=dependency_config.get('port', 80),
+            has_params=bool(check_params),
+            url=check_params.get('url', '/'),
+            expected_status=check_params.get('expected_status', 200),
+            timeout=check_params.get('timeout', self.DEFAULT_TIMEOUT),
+            auth_user=check_params.get('auth_user'),
+            auth_pass=check_params.get('auth_pass'),
+            ssl=check_params.get('ssl', False)
+        )
+
+    def check_parsed(self, parsed: 'HTTPConfig') -> Tuple[bool, str]:
+        """Valida configuración HTTP"""
+        port = parsed.port
+        if not port:
+            return False, "Puerto requerido para check HTTP"
+
+        # Caso habitual: int, sin convertir a str
+        if not isinstance(port, int) and not (isinstance(port, str) and port.isdigit()):
+            return False, "Puerto debe ser numérico"
+
+        if not parsed.url.startswith('/'):
+            return False, "URL debe comenzar con /"
+
+        return True, ""
+
+    def build_command(self, parsed: 'HTTPConfig', host_address: str) -> str:
+        """Genera comando Nagios para HTTP"""
+        # Comando base (caso habitual: sin parámetros adicionales)
+        if not parsed.has_params:
+            return f"check_http -H {host_address} -p {parsed.command_port}"
+
+        url = parsed.url
+        expected_status = parsed.expected_status
+        timeout = parsed.timeout
+        auth_user = parsed.auth_user
+        auth_pass = parsed.auth_pass
+
+        return self._TEMPLATE.format_map({
+            'host_address': host_address,
+            'port': parsed.command_port,
+            # URL específica
+            'url_part': f" -u {url}" if url != '/' else '',
+            # Status esperado
+            'status_part': f" -e {expected_status}" if expected_status != 200 else '',
+            # Timeout
+            'timeout_part': f" -t {timeout}" if timeout != self.DEFAULT_TIMEOUT else '',
+            # Autenticación
+            'auth_part': f" -a {auth_user}:{auth_pass}" if auth_user and auth_pass else '',
+            # SSL
+            'ssl_part': " -S" if parsed.ssl else ''
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class TCPConfig:
+    """Campos de una dependencia TCP"""
+    port: Any
+    has_params: bool
+    timeout: Any
+    send: Any
+    expect: Any
+    ssl: Any
+
+
+class TCPCheck(BaseCheck):
+    """Plugin para checks TCP"""
+
+    # Plantilla del comando: cada parte opcional llega ya formateada o vacía
+    _TEMPLATE = "check_tcp -H {host_address} -p {port}{timeout_part}{send_part}{expect_part}{ssl_part}"
+
+    def get_required_params(self) -> list:
+        return ['port']
+
+    def get_optional_params(self) -> list:
+        return ['timeout', 'send', 'expect', 'ssl']
+
+    def parse(self, dependency_config: Dict[str, Any]) -> 'TCPConfig':
+        """Lee una sola vez los campos de una dependencia TCP"""
+        check_params = dependency_config.get('check_params', {})
+        if not check_params:
+            check_params = {}
+
+        return TCPConfig(
+            port=dependency_config.get('port'),
+            has_params=bool(check_params),
+            timeout=check_params.get('timeout', self.DEFAULT_TIMEOUT),
+            send=check_params.get('send'),
+            expect=check_params.get('expect'),
+            ssl=check_params.get('ssl', False)
+        )
+
+    def check_parsed(self, parsed: 'TCPConfig') -> Tuple[bool, str]:
+        """Valida configuración TCP"""
+        port = parsed.port
+        if not port:
+            return False, "Puerto requerido para check TCP"
+
+        # Caso habitual: int, sin convertir a str
+        if not isinstance(port, int) and not (isinstance(port, str) and port.isdigit()):
+            return False, "Puerto debe ser numérico"
+
+        return True, ""
+
+    def build_command(self, parsed: 'TCPConfig', host_address: str) -> str:
+        """Genera comando Nagios para TCP"""
+        # Comando base (caso habitual: sin parámetros adicionales)
+        if not parsed.has_params:
+            return f"check_tcp -H {host_address} -p {parsed.port}"
+
+        timeout = parsed.timeout
+        send = parsed.send
+        expect = parsed.expect
+
+        return self._TEMPLATE.format_map({
+            'host_address': host_address,
+            'port': parsed.port,
+            # Timeout
+            'timeout_part': f" -t {timeout}" if timeout != self.DEFAULT_TIMEOUT else '',
+            # String a enviar
+            'send_part': f" -s '{send}'" if send else '',
+            # String esperada como respuesta
+            'expect_part': f" -e '{expect}'" if expect else '',
+            # SSL
+            'ssl_part': " -S" if parsed.ssl else ''
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class DockerConfig:
+    """Campos de una dependencia Docker"""
+    container_name: Any
+    check_type: Any
+    socket_path: Any
+    threshold: Any  # Tal cual en la dependencia (validación)
+    command_threshold: Any  # Con el umbral 80 por defecto (comando)
+    timeout: Any
+
+
+class DockerCheck(BaseCheck):
+    """Plugin para checks de contenedores Docker"""
+
+    # Datos de validación constantes, construidos una sola vez por clase
+    _VALID_TYPES_ORDER = ('running', 'status', 'health', 'cpu', 'memory', 'disk', 'logs')
+    VALID_TYPES = frozenset(_VALID_TYPES_ORDER)
+    THRESHOLD_TYPES = frozenset({'cpu', 'memory', 'disk'})
+    INVALID_TYPE_MSG = f"Tipo de check inválido. Válidos: {', '.join(_VALID_TYPES_ORDER)}"
+
+    # Plantilla del comando: cada parte opcional llega ya formateada o vacía
+    _TEMPLATE = "check_docker -c {container_name} -t {check_type}{socket_part}{threshold_part}{timeout_part}"
+
+    def get_required_params(self) -> list:
+        return ['container_name']
+
+    def get_optional_params(self) -> list:
+        return ['check_type', 'timeout', 'socket_path', 'cpu_threshold', 'memory_threshold', 'disk_threshold']
+
+    def parse(self, dependency_config: Dict[str, Any]) -> 'DockerConfig':
+        """Lee una sola vez los campos de una dependencia Docker"""
+        check_params = dependency_config.get('check_params', {})
+        check_type = check_params.get('check_type', 'running')
+        threshold_key = f'{check_type}_threshold'
+
+        return DockerConfig(
+            container_name=check_params.get('container_name'),
+            check_type=check_type,
+            socket_path=check_params.get('socket_path', '/var/run/docker.sock'),
+            threshold=check_params.get(threshold_key),
+            command_threshold=check_params.get(threshold_key, 80),
+            timeout=check_params.get('timeout', self.DEFAULT_TIMEOUT)
+        )
+
+    def check_parsed(self, parsed: 'DockerConfig') -> Tuple[bool, str]:
+        """Valida configuración Docker"""
+        if not parsed.container_name:
+            return False, "Nombre de contenedor requerido"
+
+        check_type = parsed.check_type
+
+        # Un valor no hashable (lista, dict) no puede buscarse en el frozenset
+        if not isinstance(check_type, str) or check_type not in self.VALID_TYPES:
+            return False, self.INVALID_TYPE_MSG
+
+        # Validar thresholds para métricas
+        if check_type in self.THRESHOLD_TYPES and parsed.threshold is None:
+            return False, f"Threshold requerido para check de {check_type}"
+
+        return True, ""
+
+    def build_command(self, parsed: 'DockerConfig', host_address: str) -> str:
+        """Genera comando Nagios para Docker"""
+        check_type = parsed.check_type
+        socket_path = parsed.socket_path
+        timeout = parsed.timeout
+
+        # Thresholds para métricas
+        if check_type in self.THRESHOLD_TYPES:
+            threshold = parsed.command_threshold
+            threshold_part = f" -w {threshold} -c {threshold + 10}"
+        else:
+            threshold_part = ''
+
+        # Comando personalizado que debe existir en Nagios
+        return self._TEMPLATE.format_map({
+            'container_name': parsed.container_name,
+            'check_type': check_type,
+            # Socket personalizado
+            'socket_part': f" -s {socket_path}" if socket_path != '/var/run/docker.sock' else '',
+            'threshold_part': threshold_part,
+            # Timeout
+            'timeout_part': f" -T {timeout}" if timeout != self.DEFAULT_TIMEOUT else ''
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class KubernetesConfig:
+    """Campos de una dependencia Kubernetes"""
+    resource_type: Any
+    resource_name: Any
+    namespace: Any
+    check_type: Any
+    kubeconfig: Any
+    threshold: Any  # Tal cual en la dependencia (validación)
+    command_threshold: Any  # Con el umbral 80 por defecto (comando)
+    replicas_min: Any
+    command_replicas_min: Any
+
+
+class KubernetesCheck(BaseCheck):
+    """Plugin para checks de Kubernetes"""
+
+    # Datos de validación constantes, construidos una sola vez por clase
+    _VALID_RESOURCE_TYPES_ORDER = ('pod', 'deployment', 'service', 'daemonset', 'statefulset')
+    VALID_RESOURCE_TYPES = frozenset(_VALID_RESOURCE_TYPES_ORDER)
+    INVALID_RESOURCE_TYPE_MSG = f"Tipo de recurso inválido. Válidos: {', '.join(_VALID_RESOURCE_TYPES_ORDER)}"
+    _VALID_CHECK_TYPES_ORDER = ('status', 'ready', 'available', 'replicas', 'cpu', 'memory')
+    VALID_CHECK_TYPES = frozenset(_VALID_CHECK_TYPES_ORDER)
+    INVALID_CHECK_TYPE_MSG = f"Tipo de check inválido. Válidos: {', '.join(_VALID_CHECK_TYPES_ORDER)}"
+    THRESHOLD_TYPES = frozenset({'cpu', 'memory'})
+
+    # Plantilla del comando: cada parte opcional llega ya formateada o vacía
+    _TEMPLATE = "check_kubernetes -t {resource_type} -n {namespace} -c {check_type}{name_part}{threshold_part}{kubeconfig_part}"
+
+    def get_required_params(self) -> list:
+        return ['resource_type']
+
+    def get_optional_params(self) -> list:
+        return ['namespace', 'resource_name', 'check_type', 'kubeconfig', 'cpu_threshold', 'memory_threshold', 'replicas_min']
+
+    def parse(self, dependency_config: Dict[str, Any]) -> 'KubernetesConfig':
+        """Lee una sola vez los campos de una dependencia Kubernetes"""
+        check_params = dependency_config.get('check_params', {})
+        check_type = check_params.get('check_type', 'status')
+        threshold_key = f'{check_type}_threshold'
+
+        return KubernetesConfig(
+            resource_type=check_params.get('resource_type'),
+            resource_name=check_params.get('resource_name', ''),
+            namespace=check_params.get('namespace', 'default'),
+            check_type=check_type,
+            kubeconfig=check_params.get('kubeconfig', '~/.kube/config'),
+            threshold=check_params.get(threshold_key),
+            command_threshold=check_params.get(threshold_key, 80),
+            replicas_min=check_params.get('replicas_min'),
+            command_replicas_min=check_params.get('replicas_min', 1)
+        )
+
+    def check_parsed(self, parsed: 'KubernetesConfig') -> Tuple[bool, str]:
+        """Valida configuración Kubernetes"""
+        resource_type = parsed.resource_type
+
+        if not resource_type:
+            return False, "Tipo de recurso requerido (pod, deployment, service)"
+
+        # Un valor no hashable (lista, dict) no puede buscarse en el frozenset
+        if not isinstance(resource_type, str) or resource_type not in self.VALID_RESOURCE_TYPES:
+            return False, self.INVALID_RESOURCE_TYPE_MSG
+
+        check_type = parsed.check_type
+        if not isinstance(check_type, str) or check_type not in self.VALID_CHECK_TYPES:
+            return False, self.INVALID_CHECK_TYPE_MSG
+
+        # Validar thresholds para métricas
+        if check_type in self.THRESHOLD_TYPES:
+            if parsed.threshold is None:
+                return False, f"Threshold requerido para check de {check_type}"
+        elif check_type == 'replicas':
+            if parsed.replicas_min is None:
+                return False, "Número mínimo de replicas requerido"
+
+        return True, ""
+
+    def build_command(self, parsed: 'KubernetesConfig', host_address: str) -> str:
+        """Genera comando Nagios para Kubernetes"""
+        check_type = parsed.check_type
+        resource_name = parsed.resource_name
+        kubeconfig = parsed.kubeconfig
+
+        # Thresholds para métricas
+        if check_type in self.THRESHOLD_TYPES:
+            threshold = parsed.command_threshold
+            threshold_part = f" -w {threshold} -c {threshold + 10}"
+        elif check_type == 'replicas':
+            threshold_part = f" -m {parsed.command_replicas_min}"
+        else:
+            threshold_part = ''
+
+        # Comando personalizado para Kubernetes
+        return self._TEMPLATE.format_map({
+            'resource_type': parsed.resource_type,
+            'namespace': parsed.namespace,
+            'check_type': check_type,
+            'name_part': f" -r {resource_name}" if resource_name else '',
+            'threshold_part': threshold_part,
+            'kubeconfig_part': f" -k {kubeconfig}" if kubeconfig != '~/.kube/config' else ''
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class PrometheusConfig:
+    """Campos de una dependencia Prometheus"""
+    query: Any
+    prometheus_url: Any
+    threshold_warning: Any
+    threshold_critical: Any
+    comparison: Any
+
+
+class PrometheusCheck(BaseCheck):
+    """Plugin para checks de métricas Prometheus"""
+
+    # Datos de validación constantes, construidos una sola vez por clase
+    _VALID_COMPARISONS_ORDER = ('>', '<', '>=', '<=', '==', '!=')
+    VALID_COMPARISONS = frozenset(_VALID_COMPARISONS_ORDER)
+    INVALID_COMPARISON_MSG = f"Comparación inválida. Válidas: {', '.join(_VALID_COMPARISONS_ORDER)}"
+
+    # Plantilla del comando
+    _TEMPLATE = "check_prometheus_metric -u {prometheus_url} -q '{query}' -w {threshold_warning} -c {threshold_critical} -o {comparison}"
+
+    def get_required_params(self) -> list:
+        return ['query']
+
+    def get_optional_params(self) -> list:
+        return ['prometheus_url', 'threshold_warning', 'threshold_critical', 'comparison']
+
+    def parse(self, dependency_config: Dict[str, Any]) -> 'PrometheusConfig':
+        """Lee una sola vez los campos de una dependencia Prometheus"""
+        check_params = dependency_config.get('check_params', {})
+
+        return PrometheusConfig(
+            query=check_params.get('query'),
+            prometheus_url=check_params.get('prometheus_url', 'http://localhost:9090'),
+            threshold_warning=check_params.get('threshold_warning', 80),
+            threshold_critical=check_params.get('threshold_critical', 90),
+            comparison=check_params.get('comparison', '>')
+        )
+
+    def check_parsed(self, parsed: 'PrometheusConfig') -> Tuple[bool, str]:
+        """Valida configuración Prometheus"""
+        if not parsed.query:
+            return False, "Query de Prometheus requerida"
+
+        if parsed.comparison not in self.VALID_COMPARISONS:
+            return False, self.INVALID_COMPARISON_MSG
+
+        return True, ""
+
+    def build_command(self, parsed: 'PrometheusConfig', host_address: str) -> str:
+        """Genera comando Nagios para Prometheus"""
+        # Comando personalizado para Prometheus
+        return self._TEMPLATE.format_map({
+            'query': parsed.query,
+            'prometheus_url': parsed.prometheus_url,
+            'threshold_warning': parsed.threshold_warning,
+            'threshold_critical': parsed.threshold_critical,
+            'comparison': parsed.comparison
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class CustomConfig:
+    """Campos de una dependencia custom"""
+    command: Any
+    args: Any
+    timeout: Any
+    working_directory: Any
+
+
+class CustomCheck(BaseCheck):
+    """Plugin para checks personalizados"""
+
+    # Plantilla del comando: cada parte opcional llega ya formateada o vacía
+    _TEMPLATE = "check_custom_command -c '{command}'{args_part}{timeout_part}{dir_part}"
+
+    def get_required_params(self) -> list:
+        return ['command']
+
+    def get_optional_params(self) -> list:
+        return ['args', 'timeout', 'working_directory']
+
+    def parse(self, dependency_config: Dict[str, Any]) -> 'CustomConfig':
+        """Lee una sola vez los campos de una dependencia custom"""
+        check_params = dependency_config.get('check_params', {})
+
+        return CustomConfig(
+            command=check_params.get('command'),
+            args=check_params.get('args', []),
+            timeout=check_params.get('timeout', self.DEFAULT_TIMEOUT),
+            working_directory=check_params.get('working_directory', '')
+        )
+
+    def check_parsed(self, parsed: 'CustomConfig') -> Tuple[bool, str]:
+        """Valida configuración custom"""
+        if not parsed.command:
+            return False, "Comando requerido para check custom"
+
+        return True, ""
+
+    def build_command(self, parsed: 'CustomConfig', host_address: str) -> str:
+        """Genera comando Nagios para check custom"""
+        args = parsed.args
+        timeout = parsed.timeout
+        working_dir = parsed.working_directory
+
+        if args:
+            args_str = " ".join(str(arg) for arg in args) if isinstance(args, list) else str(args)
+            args_part = f" -a '{args_str}'"
+        else:
+            args_part = ''
+
+        # Comando personalizado
+        return self._TEMPLATE.format_map({
+            'command': parsed.command,
+            'args_part': args_part,
+            'timeout_part': f" -t {timeout}" if timeout != self.DEFAULT_TIMEOUT else '',
+            'dir_part': f" -d '{working_dir}'" if working_dir else ''
+        })
@@ -12,25 +12,58 @@ import logging
 class BaseCheck(ABC):
     """Clase base para todos los plugins de checks"""
 
+    # Timeout e intervalo por defecto en segundos
+    DEFAULT_TIMEOUT = 30
+    DEFAULT_INTERVAL = 300
+
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
         self.logger = logging.getLogger(f'check.{name}')
 
-    @abstractmethod
-    def get_nagios_command(self, dependency_config: Dict[str, Any]) -> str:
+    def __init_subclass__(cls, **kwargs):
+        """
+        Comprueba al definir cada plugin que implementa uno de los dos contratos:
+        parse y build_command (check_parsed es opcional) o, en plugins sin parse,
+        get_nagios_command (validate_config es opcional)
+
+        parse(dependency_config) lee una sola vez los campos de la configuración en un
+        registro tipado; build_command(parsed, host_address) genera el comando a partir
+        de ese registro
+        """
+        super().__init_subclass__(**kwargs)
+
+        has_parse = hasattr(cls, 'parse')
+        if has_parse != hasattr(cls, 'build_command'):
+            raise TypeError(f"{cls.__name__} debe implementar parse y build_command juntos")
+
+        if not has_parse and cls.get_nagios_command is BaseCheck.get_nagios_command:
+            raise TypeError(f"{cls.__name__} debe implementar parse y build_command, o get_nagios_command")
+
+    def check_parsed(self, parsed: Any) -> Tuple[bool, str]:
+        """
+        Valida una configuración ya leída con parse; por defecto la acepta
+
+        Returns:
+            (válido, mensaje_error)
+        """
+        return True, ""
+
+    def get_nagios_command(self, dependency_config: Dict[str, Any], host_address: Optional[str] = None) -> str:
         """
         Genera el comando de Nagios para este check
 
         Args:
             dependency_config: Configuración de la dependencia desde JSON
+            host_address: Dirección del host; por defecto la clave 'host_address' de la configuración
 
         Returns:
             Comando de Nagios completo
         """
-        pass
+        if host_address is None:
+            host_address = dependency_config.get('host_address', '')
+        return self.build_command(self.parse(dependency_config), host_address)
 
-    @abstractmethod
     def validate_config(self, dependency_config: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Valida que la configuración sea correcta
@@ -41,7 +74,10 @@ class BaseCheck(ABC):
         Returns:
             (válido, mensaje_error)
         """
-        pass
+        if not hasattr(self, 'parse'):
+            # Plugins sin parse: no hay registro tipado que validar
+            return True, ""
+        return self.check_parsed(self.parse(dependency_config))
 
     @abstractmethod
     def get_required_params(self) -> list:
@@ -72,21 +108,17 @@ class BaseCheck(ABC):
         Returns:
             String formateado para comando
         """
-        formatted = []
-        for key, value in params.items():
-            if isinstance(value, bool):
-                if value:
-                    formatted.append(f"-{key}")
-            elif isinstance(value, (int, float)):
-                formatted.append(f"-{key} {value}")
-            else:
-                formatted.append(f"-{key} {value}")
-        return " ".join(formatted)
+        # Los bool son flags (solo se emiten si son True); cualquier otro valor va tras su opción
+        return " ".join(
+            f"-{key}" if value is True else f"-{key} {value}"
+            for key, value in params.items()
+            if value is not False
+        )
 
     def get_default_timeout(self) -> int:
-        """Timeout por defecto en segundos"""
-        return 30
+        """Timeout por defecto en segundos (compatibilidad: usar DEFAULT_TIMEOUT)"""
+        return self.DEFAULT_TIMEOUT
 
     def get_default_interval(self) -> int:
-        """Intervalo por defecto en segundos"""
-        return 300
\ No newline at end of file
+        """Intervalo por defecto en segundos (compatibilidad: usar DEFAULT_INTERVAL)"""
+        return self.DEFAULT_INTERVAL
\ No newline at end of file
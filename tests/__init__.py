@@ -0,0 +1,2 @@
+# Tests de regresión del sistema de automatización de monitorización
+# Ejecutar desde la raíz del repositorio: python -m unittest discover -s tests -t .
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests del contrato de los plugins de checks (BaseCheck)
+"""
+
+import unittest
+
+from plugins.check_manager import CheckManager
+from plugins.checks.base import BaseCheck
+
+
+class CheckContractTest(unittest.TestCase):
+
+    def test_plugin_without_command_is_rejected(self):
+        with self.assertRaises(TypeError):
+            class EmptyCheck(BaseCheck):
+                def get_required_params(self):
+                    return []
+
+    def test_parse_without_build_command_is_rejected(self):
+        with self.assertRaises(TypeError):
+            class HalfCheck(BaseCheck):
+                def get_required_params(self):
+                    return []
+
+                def parse(self, dependency_config):
+                    return dependency_config
+
+    def test_legacy_plugin_builds_commands(self):
+        class MQTTCheck(BaseCheck):
+            def get_required_params(self):
+                return ['port']
+
+            def get_nagios_command(self, dependency_config):
+                return f"check_mqtt -H {dependency_config['host_address']} -p {dependency_config['port']}"
+
+        manager = CheckManager()
+        manager.checks['mqtt'] = MQTTCheck
+        build = manager.get_command_builder({'check_protocol': 'mqtt', 'port': 1883})
+
+        self.assertEqual(build('10.0.0.1'), 'check_mqtt -H 10.0.0.1 -p 1883')
+        self.assertEqual(manager.validate_dependency_config({'check_protocol': 'mqtt', 'port': 1883}), (True, ""))
+
+    def test_parsed_plugin_builds_commands(self):
+        class EchoCheck(BaseCheck):
+            def get_required_params(self):
+                return []
+
+            def parse(self, dependency_config):
+                return dependency_config['port']
+
+            def build_command(self, parsed, host_address):
+                return f"check_echo -H {host_address} -p {parsed}"
+
+        manager = CheckManager()
+        manager.checks['echo'] = EchoCheck
+        build = manager.get_command_builder({'check_protocol': 'echo', 'port': 7})
+
+        self.assertEqual(build('10.0.0.2'), 'check_echo -H 10.0.0.2 -p 7')
+
+    def test_non_string_types_are_invalid(self):
+        manager = CheckManager()
+        for protocol, params in (('docker', {'container_name': 'web', 'check_type': ['cpu']}),
+                                 ('kubernetes', {'resource_type': ['pod']}),
+                                 ('kubernetes', {'resource_type': 'pod', 'check_type': {'status': 1}})):
+            with self.subTest(protocol=protocol, params=params):
+                config = {'check_protocol': protocol, 'container_name': 'web', 'resource_type': 'pod', 'check_params': params}
+                valid, message = manager.validate_dependency_config(config)
+
+                self.assertFalse(valid)
+                self.assertIn('inválido', message)
+
+
+if __name__ == '__main__':
+    unittest.main()
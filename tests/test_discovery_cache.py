@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests de la caché de auto-detección (--skip-discovery-if-unchanged)
+"""
+
+import copy
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import monitoring_automator
+from monitoring_automator import MonitoringAutomator
+
+EXAMPLE_JSON = Path(__file__).resolve().parent.parent / 'service_example.json'
+
+
+def fake_discovery(data):
+    """Auto-detección simulada: añade una dependencia detectada"""
+    data = copy.deepcopy(data)
+    data['dependencies'].append({'name': 'Detectada', 'port': '9999', 'check_protocol': 'tcp'})
+    return data
+
+
+class DiscoveryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.automator = MonitoringAutomator(output_base_dir=self.tmp.name, skip_discovery_if_unchanged=True)
+        with open(EXAMPLE_JSON, encoding='utf-8') as f:
+            self.data = json.load(f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_discovery(self, data):
+        with mock.patch.object(monitoring_automator, 'discover_services', side_effect=fake_discovery) as discover:
+            result = self.automator.run_service_discovery(data)
+        return result, discover.call_count
+
+    def test_unchanged_input_reuses_cache(self):
+        first, calls = self.run_discovery(copy.deepcopy(self.data))
+        self.assertEqual(calls, 1)
+        second, calls = self.run_discovery(copy.deepcopy(self.data))
+        self.assertEqual(calls, 0)
+        self.assertEqual(first, second)
+
+    def test_edits_outside_dependency_hosts_invalidate_cache(self):
+        self.run_discovery(copy.deepcopy(self.data))
+
+        edits = [
+            lambda d: d['identification'].__setitem__('service_name', 'Otro servicio'),
+            lambda d: d['responsables'][0].__setitem__('email', 'otro@empresa.com'),
+            lambda d: d['logs'].append({'name': 'nuevo'}),
+            lambda d: d['dependencies'][0].__setitem__('check_protocol', 'http'),
+            lambda d: d['dependencies'][0].__setitem__('check_params', {'url': '/health'}),
+            lambda d: d['envs'][0]['hosts'][0].__setitem__('address', '10.0.0.99'),
+        ]
+        for edit in edits:
+            data = copy.deepcopy(self.data)
+            edit(data)
+            result, calls = self.run_discovery(data)
+            self.assertEqual(calls, 1)
+            # El resultado refleja la entrada actual, no la de la ejecución anterior
+            expected = fake_discovery(data)
+            self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests de la carga del JSON de entrada (orjson con fallback a json)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import monitoring_automator
+from monitoring_automator import MonitoringAutomator
+
+EXAMPLE_JSON = Path(__file__).resolve().parent.parent / 'service_example.json'
+
+
+class ValidateJsonTest(unittest.TestCase):
+    """validate_json decodifica igual con orjson y con la librería estándar"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.automator = MonitoringAutomator(output_base_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_loads_example_with_available_decoder(self):
+        ok, data = self.automator.validate_json(EXAMPLE_JSON)
+        self.assertTrue(ok)
+        with open(EXAMPLE_JSON, encoding='utf-8') as f:
+            self.assertEqual(data, json.load(f))
+
+    def test_loads_example_with_stdlib_fallback(self):
+        with mock.patch.object(monitoring_automator, 'ORJSON_AVAILABLE', False):
+            ok, data = self.automator.validate_json(EXAMPLE_JSON)
+        self.assertTrue(ok)
+        self.assertIn('identification', data)
+
+    def test_invalid_json_is_rejected(self):
+        path = os.path.join(self.tmp.name, 'broken.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"identification": ')
+        self.assertEqual(self.automator.validate_json(path), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests de compatibilidad de la API pública del generador de Nagios
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from nagios_generator import NagiosConfigGenerator
+
+EXAMPLE_JSON = Path(__file__).resolve().parent.parent / 'service_example.json'
+
+
+class GeneratorApiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(EXAMPLE_JSON, encoding='utf-8') as f:
+            self.generator = NagiosConfigGenerator(json.load(f), self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_generate_without_out_returns_config_and_dicts(self):
+        for generate, define in ((self.generator.generate_hosts_config, 'define host {'),
+                                 (self.generator.generate_contacts_config, 'define contact {'),
+                                 (self.generator.generate_services_config, 'define service {')):
+            with self.subTest(generate=generate.__name__):
+                config, records = generate()
+
+                self.assertIn(define, config)
+                self.assertTrue(records)
+                self.assertTrue(all(isinstance(record, dict) for record in records))
+
+    def test_metadata_records_are_dicts(self):
+        files, metadata = self.generator.generate_all_configs()
+
+        self.assertEqual(len(files), 5)
+        self.assertIn('host_name', metadata['hosts'][0])
+        self.assertIn('contact_name', metadata['contacts'][0])
+        self.assertIn('check_command', metadata['services'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
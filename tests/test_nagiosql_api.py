@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests del cliente de la API REST de NagiosQL (sin red: la sesión HTTP se simula)
+"""
+
+import threading
+import unittest
+from unittest import mock
+
+from nagiosql_adapter import NagiosQLAdapter, _HOST_DEFAULTS
+
+BASE_URL = 'http://nagiosql.test'
+
+
+def fake_response(status_code=200, content=b'[]'):
+    response = mock.Mock(status_code=status_code, content=content, headers={}, text=content.decode())
+    return response
+
+
+def make_adapter(**config):
+    adapter = NagiosQLAdapter({'api_url': BASE_URL, **config})
+    adapter.session = mock.Mock()
+    return adapter
+
+
+class HttpSessionTest(unittest.TestCase):
+
+    def test_post_is_not_retried(self):
+        adapter = NagiosQLAdapter({'api_url': BASE_URL})
+        retries = adapter.session.get_adapter(BASE_URL).max_retries
+
+        self.assertIn('GET', retries.allowed_methods)
+        self.assertIn('PUT', retries.allowed_methods)
+        self.assertNotIn('POST', retries.allowed_methods)
+
+
+class GetCacheTest(unittest.TestCase):
+
+    def test_cached_get_reuses_response(self):
+        adapter = make_adapter()
+        adapter.session.get.return_value = fake_response(content=b'[{"id": 1}]')
+
+        first = adapter._cached_get(f'{BASE_URL}/api/v1/host')
+        second = adapter._cached_get(f'{BASE_URL}/api/v1/host')
+
+        self.assertEqual(first[2], [{'id': 1}])
+        self.assertEqual(second, first)
+        self.assertEqual(adapter.session.get.call_count, 1)
+
+    def test_invalidate_while_other_worker_inserts(self):
+        adapter = make_adapter()
+        adapter.session.get.return_value = fake_response()
+        errors = []
+
+        def insert():
+            try:
+                adapter._cached_get(f'{BASE_URL}/api/v1/service', {'page': '2'})
+            except Exception as e:  # pragma: no cover - solo si la caché no está protegida
+                errors.append(e)
+
+        class InterleavedCache(dict):
+            """Dict que cede el paso a otro worker a mitad de una iteración"""
+
+            def __iter__(self):
+                keys = super().__iter__()
+                yield next(keys)
+                worker = threading.Thread(target=insert)
+                worker.start()
+                # Con la caché protegida el worker espera al lock; sin ella inserta ya
+                worker.join(0.2)
+                self.worker = worker
+                yield from keys
+
+        adapter._get_cache = InterleavedCache({
+            (f'{BASE_URL}/api/v1/host', frozenset()): (0.0, 200, {}, []),
+            (f'{BASE_URL}/api/v1/host/1', frozenset()): (0.0, 200, {}, []),
+        })
+
+        adapter._invalidate_get_cache('host')
+        adapter._get_cache.worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(list(adapter._get_cache), [(f'{BASE_URL}/api/v1/service', frozenset({('page', '2')}))])
+
+
+class ImportObjectsTest(unittest.TestCase):
+    """Importación objeto a objeto (API sin endpoint masivo)"""
+
+    def setUp(self):
+        self.adapter = make_adapter()
+        session = self.adapter.session
+        session.post.side_effect = self.post
+        session.get.return_value = fake_response(
+            content=b'[{"id": 7, "_checksum": "old", "host_name": "web1"}]'
+        )
+        session.put.return_value = fake_response(content=b'{}')
+        self.post_status = 201
+
+    def post(self, url, **kwargs):
+        if url.endswith('/bulk'):
+            return fake_response(status_code=404, content=b'')
+        return fake_response(status_code=self.post_status, content=b'{"id": 8}')
+
+    def hosts(self, *names):
+        blocks = [{'host_name': name, 'address': '10.0.0.9'} for name in names]
+        return self.adapter._build_objects(blocks, _HOST_DEFAULTS)
+
+    def object_posts(self):
+        return [c for c in self.adapter.session.post.call_args_list if not c.args[0].endswith('/bulk')]
+
+    def test_changed_object_is_updated(self):
+        self.assertTrue(self.adapter._import_objects_via_api('hosts', self.hosts('web1', 'web2')))
+
+        self.adapter.session.put.assert_called_once()
+        self.assertEqual(self.adapter.session.put.call_args.args[0], f'{BASE_URL}/api/v1/hosts/7')
+        self.assertEqual(len(self.object_posts()), 1)
+        # El checksum anterior deja de identificar al objeto actualizado
+        self.assertNotIn('old', self.adapter._checksum_index['hosts'])
+
+    def test_update_existing_disabled_creates(self):
+        self.adapter.update_existing = False
+
+        self.assertTrue(self.adapter._import_objects_via_api('hosts', self.hosts('web1')))
+
+        self.adapter.session.put.assert_not_called()
+        self.assertEqual(len(self.object_posts()), 1)
+
+    def test_create_error_message(self):
+        self.post_status = 500
+
+        with self.assertLogs('NagiosQLAdapter', 'ERROR') as logs:
+            self.assertFalse(self.adapter._import_objects_via_api('hosts', self.hosts('web2')))
+
+        self.assertIn('Error creando objeto hosts', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
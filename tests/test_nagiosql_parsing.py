@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests del parseo de configuraciones de Nagios en el adaptador de NagiosQL
+"""
+
+import hashlib
+import json
+import unittest
+
+from nagiosql_adapter import NagiosQLAdapter, _HOST_DEFAULTS, _SERVICE_DEFAULTS
+
+CONFIG = """
+# Comandos generados
+define command {
+    command_name    check_json
+    command_line    $USER1$/check_json -d '{"status": "ok"}' -u ${BASE_URL}/health
+    register        1
+}
+
+define host {
+    host_name       web1
+    address         10.0.0.1
+}
+"""
+
+
+class ParseBlocksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.adapter = NagiosQLAdapter({})
+
+    def test_braces_inside_values_do_not_end_block(self):
+        blocks = self.adapter._parse_all_blocks(CONFIG)
+
+        command = blocks['command'][0]
+        self.assertEqual(command['command_line'], """$USER1$/check_json -d '{"status": "ok"}' -u ${BASE_URL}/health""")
+        self.assertEqual(command['register'], '1')
+
+    def test_all_blocks_grouped_by_type(self):
+        blocks = self.adapter._parse_all_blocks(CONFIG)
+
+        self.assertEqual(sorted(blocks), ['command', 'host'])
+        self.assertEqual(blocks['host'][0]['address'], '10.0.0.1')
+
+
+VALID_OBJECTS = b"""
+define host {
+    name                generic-host
+    check_interval      5
+    register            0
+}
+
+define host {
+    use                 generic-host
+    host_name           web1
+}
+
+define service {
+    hostgroup_name      web
+    service_description HTTP
+    check_command       check_http
+    check_interval      0.5
+    retry_interval      .5
+}
+"""
+
+
+class InlineValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.adapter = NagiosQLAdapter({})
+
+    def test_templates_hostgroups_and_decimal_intervals_are_valid(self):
+        self.assertTrue(self.adapter._validate_inline({'objects.cfg': VALID_OBJECTS}))
+
+    def test_missing_fields_and_invalid_numbers_are_errors(self):
+        config = b"""
+define service {
+    service_description HTTP
+    check_command       check_http
+    check_interval      cada-5
+}
+"""
+        self.assertFalse(self.adapter._validate_inline({'services.cfg': config}))
+
+    def test_decimal_intervals_are_kept(self):
+        blocks = self.adapter._parse_all_blocks(VALID_OBJECTS.decode())['service']
+        service = self.adapter._build_objects(blocks, _SERVICE_DEFAULTS)[0]
+
+        self.assertEqual(service['check_interval'], 0.5)
+
+
+def legacy_checksum(obj):
+    """Checksum de objetos de versiones anteriores del adaptador"""
+    clean_obj = {k: v for k, v in obj.items() if not k.startswith('_')}
+    return hashlib.md5(json.dumps(clean_obj, sort_keys=True).encode()).hexdigest()
+
+
+class ChecksumTest(unittest.TestCase):
+
+    def build_host(self, adapter):
+        blocks = adapter._parse_all_blocks(CONFIG)['host']
+        return adapter._build_objects(blocks, _HOST_DEFAULTS)[0]
+
+    def test_md5_matches_previous_versions(self):
+        adapter = NagiosQLAdapter({'checksum_algorithm': 'md5'})
+        host = self.build_host(adapter)
+
+        self.assertEqual(host['_checksum'], legacy_checksum(host))
+
+    def test_objects_with_legacy_checksum_are_unchanged(self):
+        adapter = NagiosQLAdapter({})
+        host = self.build_host(adapter)
+        self.assertNotEqual(host['_checksum'], legacy_checksum(host))
+
+        pending = adapter._skip_unchanged('hosts', [host], {legacy_checksum(host): '7'})
+
+        self.assertEqual(pending, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
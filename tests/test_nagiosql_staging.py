@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests del staging de archivos para importación en NagiosQL (SSH simulado)
+"""
+
+import io
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from nagiosql_adapter import NagiosQLAdapter
+
+IMPORT_DIR = '/var/lib/nagiosql/import'
+CONFIG = {'hosts.cfg': b'define host {\n    host_name  web1\n}\n', 'contacts.cfg': b'# vacio\n'}
+
+
+class FakeSSH:
+    """Conexión SSH simulada: el comando de checksums lista los archivos de `remote`"""
+
+    def __init__(self, adapter, remote):
+        self.adapter = adapter
+        self.remote = remote
+
+    def exec_command(self, command):
+        output = ''
+        if command.startswith(self.adapter._remote_checksum_command):
+            output = ''.join(
+                f"{self.adapter._hash(data)}  {os.path.join(IMPORT_DIR, filename)}\n"
+                for filename, data in self.remote.items()
+            )
+        return None, command_output(output.encode(), 0), None
+
+
+def command_output(data, status):
+    """Salida de un comando remoto con su código de salida, como la de paramiko"""
+    stdout = io.BytesIO(data)
+    stdout.channel = mock.Mock(**{'recv_exit_status.return_value': status})
+    return stdout
+
+
+class LocalSSH:
+    """Conexión SSH simulada que ejecuta los comandos remotos en una shell local"""
+
+    # Comandos que se simulan ausentes en el servidor
+    missing = ()
+
+    def exec_command(self, command):
+        for name in self.missing:
+            command = command.replace(name, f"{name}-no-instalado")
+        result = subprocess.run(['/bin/sh', '-c', command], capture_output=True)
+        return None, command_output(result.stdout, result.returncode), io.BytesIO(result.stderr)
+
+
+def upload_locally(ssh, uploads):
+    for path, data in uploads:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+class StagingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.adapter = NagiosQLAdapter({
+            'import_directory': IMPORT_DIR,
+            'staging_hash_cache': os.path.join(self.tmp.name, 'hashes.json'),
+            'create_backups': False,
+        })
+        self.adapter.import_session_id = 'test'
+        # Manifiesto local: todos los archivos se prepararon ya en una sesión anterior
+        for filename, data in CONFIG.items():
+            self.adapter._hash_cache[self.adapter._hash_cache_key(filename)] = self.adapter._hash(data)
+
+        for name, value in (('_run_remote', 0), ('_upload_files', None), ('_save_hash_cache', None)):
+            patcher = mock.patch.object(self.adapter, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def stage(self, remote):
+        ssh = FakeSSH(self.adapter, remote)
+        with mock.patch.object(self.adapter, '_conn', return_value=ssh):
+            idempotent = self.adapter._check_idempotency(CONFIG)
+            self.assertTrue(self.adapter._stage_files_for_import(CONFIG))
+        return idempotent
+
+    def test_unchanged_files_are_reported_as_skipped(self):
+        self.assertTrue(self.stage(dict(CONFIG)))
+
+        self.assertEqual(self.adapter.staged_files, {})
+        self.assertEqual(self.adapter.skipped_files, ['hosts.cfg', 'contacts.cfg'])
+
+    def test_file_deleted_on_server_is_restaged(self):
+        remote = dict(CONFIG)
+        del remote['hosts.cfg']
+
+        self.stage(remote)
+
+        self.assertEqual(list(self.adapter.staged_files), ['hosts.cfg'])
+        self.assertEqual(self.adapter.skipped_files, ['contacts.cfg'])
+
+    def test_file_edited_on_server_is_restaged(self):
+        remote = dict(CONFIG, **{'contacts.cfg': b'# editado a mano\n'})
+
+        self.assertFalse(self.stage(remote))
+
+        self.assertEqual(list(self.adapter.staged_files), ['contacts.cfg'])
+        self.assertEqual(self.adapter.skipped_files, ['hosts.cfg'])
+
+
+class LocalStagingTest(unittest.TestCase):
+    """Staging completo contra un directorio de importación local"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.import_dir = os.path.join(self.tmp.name, 'import')
+        self.adapter = NagiosQLAdapter({
+            'import_directory': self.import_dir,
+            'backup_directory': os.path.join(self.tmp.name, 'backup'),
+            'staging_hash_cache': os.path.join(self.tmp.name, 'hashes.json'),
+        })
+        self.ssh = LocalSSH()
+        for name, kwargs in (('_conn', {'return_value': self.ssh}), ('_upload_files', {'side_effect': upload_locally})):
+            patcher = mock.patch.object(self.adapter, name, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def stage(self, session_id):
+        self.adapter.import_session_id = session_id
+        self.adapter._check_idempotency(CONFIG)
+        self.assertTrue(self.adapter._stage_files_for_import(CONFIG))
+
+    def read(self, *parts):
+        with open(os.path.join(self.import_dir, *parts), 'rb') as f:
+            return f.read()
+
+    def test_import_file_edited_on_server_is_restaged(self):
+        self.stage('s1')
+        with open(os.path.join(self.import_dir, 'hosts.cfg'), 'ab') as f:
+            f.write(b'# editado a mano\n')
+
+        self.stage('s2')
+
+        self.assertEqual(list(self.adapter.staged_files), ['hosts.cfg'])
+        self.assertEqual(self.read('hosts.cfg'), CONFIG['hosts.cfg'])
+        self.assertEqual(self.read('s2', 'hosts.cfg'), CONFIG['hosts.cfg'])
+
+    def test_session_copy_does_not_share_import_file(self):
+        self.stage('s1')
+        with open(os.path.join(self.import_dir, 'hosts.cfg'), 'ab') as f:
+            f.write(b'# editado a mano\n')
+
+        checksum = self.adapter._hash(CONFIG['hosts.cfg'])
+        self.assertEqual(self.read('s1', 'hosts.cfg'), CONFIG['hosts.cfg'])
+        self.assertEqual(self.read('.cas', checksum), CONFIG['hosts.cfg'])
+
+    def test_server_without_b2sum_falls_back_to_md5sum(self):
+        self.ssh.missing = ('b2sum',)
+        self.stage('s1')
+        with open(os.path.join(self.import_dir, 'hosts.cfg'), 'ab') as f:
+            f.write(b'# editado a mano\n')
+
+        with self.assertLogs('NagiosQLAdapter', 'WARNING'):
+            self.assertFalse(self.adapter._check_idempotency(CONFIG))
+
+        self.assertEqual(self.adapter._remote_checksum_command, 'md5sum')
+        self.assertEqual([c['file'] for c in self.adapter.validation_results['idempotency_conflicts']], ['hosts.cfg'])
+
+    def test_failed_checksum_command_is_not_a_pass(self):
+        self.ssh.missing = ('b2sum', 'md5sum')
+
+        with self.assertLogs('NagiosQLAdapter', 'ERROR'):
+            self.assertFalse(self.adapter._check_idempotency(CONFIG))
+
+        self.assertNotIn('idempotency_check', self.adapter.validation_results)
+        self.assertIsNone(self.adapter._remote_checksums)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests de la agrupación de servicios Nagios por comando de check
+"""
+
+import io
+import tempfile
+import unittest
+
+from nagios_generator import NagiosConfigGenerator
+
+
+def service_data(hosts):
+    """Servicio mínimo con una dependencia TCP y un único entorno"""
+    return {
+        'identification': {'service_name': 'Grupos', 'priority': 'Media'},
+        'envs': [{'name': 'Dev', 'desc': 'Desarrollo', 'hosts': hosts}],
+        'dependencies': [{'name': 'Postgres', 'port': '5432', 'check_protocol': 'tcp', 'impact': 'Media'}],
+    }
+
+
+class ServiceGroupingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def generate(self, hosts):
+        generator = NagiosConfigGenerator(service_data(hosts), self.tmp.name)
+        out = io.StringIO()
+        services = generator.generate_services_config(out)
+        return out.getvalue(), services
+
+    def host_name_lines(self, config):
+        return [line.split(None, 1)[1] for line in config.splitlines()
+                if line.strip().startswith('host_name')]
+
+    def test_duplicate_host_listed_once(self):
+        host = {'type': 'host', 'identifier': '10.0.0.1', 'address': '10.0.0.1'}
+        config, services = self.generate([host, dict(host)])
+
+        host_names = self.host_name_lines(config)
+        self.assertEqual(len(host_names), 1)
+        self.assertEqual(host_names[0].strip().split(','), ['host_dev_10_0_0_1'])
+        self.assertEqual(len(services), 1)
+
+    def test_metadata_counts_checks_per_host(self):
+        hosts = [
+            {'type': 'host', 'identifier': 'web1', 'address': '10.0.0.1'},
+            {'type': 'host', 'identifier': 'web2', 'address': '10.0.0.1'},
+        ]
+        config, services = self.generate(hosts)
+
+        # Los hosts comparten dirección y por tanto definición, pero cada check por host se sigue contando
+        self.assertEqual(len(self.host_name_lines(config)), 1)
+        self.assertEqual([s.host_name for s in services], ['host_dev_web1', 'host_dev_web2'])
+
+
+if __name__ == '__main__':
+    unittest.main()